@@ -0,0 +1,59 @@
+import sys
+import os
+current_directory = os.getcwd()
+main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
+sys.path.insert(0, main_directory_path)
+
+import time
+import numpy as np
+from biztools.iterable_statistics import IterableStatistics
+
+
+def _timeit(func, repeat=3):
+    """Returns the best wall-clock time of `repeat` runs of func."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _sort_median(valid_items):
+    """The previous implementation: sort the whole list and read the middle element(s)."""
+    valid_items = sorted(valid_items)
+    n = len(valid_items)
+    return valid_items[n // 2] if n % 2 != 0 else (valid_items[n // 2 - 1] + valid_items[n // 2]) / 2
+
+
+def benchmark_median_selection(sizes=(10 ** 6, 10 ** 7)):
+    """Compares sorting with linear-time selection for the median (pass 10 ** 8 for the largest run)."""
+    rng = np.random.default_rng(42)
+    for n in sizes:
+        items = rng.uniform(0, 1000, size=n).tolist()
+        sort_time = _timeit(lambda: _sort_median(items), repeat=1)
+        select_time = _timeit(lambda: IterableStatistics._select_median(items), repeat=1)
+        print(f"median n={n:,}: sort={sort_time:.3f}s select={select_time:.3f}s "
+              f"speedup={sort_time / select_time:.1f}x")
+
+
+def benchmark_numeric_buffer(n=10 ** 7):
+    """Compares ndarray inputs (vectorized fast path) with the same data as a Python list."""
+    values = np.random.default_rng(42).uniform(0, 1000, size=n)
+    values[::100] = np.nan
+    as_list = values.tolist()
+    for name in ('iterable_sum', 'iterable_std_var', 'iterable_mad'):
+        method = getattr(IterableStatistics, name)
+        list_time = _timeit(lambda: method(as_list), repeat=1)
+        array_time = _timeit(lambda: method(values))
+        print(f"{name} n={n:,}: list={list_time:.3f}s ndarray={array_time:.3f}s "
+              f"speedup={list_time / array_time:.1f}x")
+
+
+def main():
+    benchmark_median_selection()
+    benchmark_numeric_buffer()
+
+
+if __name__ == "__main__":
+    main()
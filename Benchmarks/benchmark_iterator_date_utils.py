@@ -0,0 +1,189 @@
+import sys
+import os
+current_directory = os.getcwd()
+main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
+sys.path.insert(0, main_directory_path)
+
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import warnings
+from pandas.tseries.offsets import CustomBusinessDay
+from biztools.iterator_date_utils import IteratorDateUtils
+from biztools.business_calendar import BusinessCalendar
+from biztools.fiscal_calendar import FiscalCalendar
+
+
+def _timeit(func, repeat=3):
+    """Returns the best wall-clock time of `repeat` runs of func."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _order_frame(n, seed=42):
+    """Order and delivery dates spread over ten years, with a time of day and about 1% missing deliveries."""
+    rng = np.random.default_rng(seed)
+    order_date = pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 10 * 365 * 24, size=n), unit='h')
+    delivery_date = order_date + pd.to_timedelta(rng.integers(0, 30, size=n), unit='D')
+    delivery_date = delivery_date.where(rng.random(n) > 0.01)
+    return pd.DataFrame({'order_date': order_date, 'delivery_date': delivery_date})
+
+
+def _apply_business_days(df, start_date_col, end_date_col):
+    """The row-by-row implementation: one bdate_range per row."""
+    return df.apply(
+        lambda row: len(pd.bdate_range(start=row[start_date_col], end=row[end_date_col])) - 1
+        if pd.notnull(row[start_date_col]) and pd.notnull(row[end_date_col]) else None,
+        axis=1
+    )
+
+
+def benchmark_business_days(sizes=(10 ** 6, 10 ** 7), apply_rows=20_000):
+    """Vectorized busday_count vs one bdate_range per row (timed on `apply_rows` rows, its cost is linear)."""
+    sample = _order_frame(apply_rows)
+    apply_time = _timeit(lambda: _apply_business_days(sample, 'order_date', 'delivery_date'), repeat=1) / apply_rows
+    for n in sizes:
+        df = _order_frame(n)
+        between_time = _timeit(lambda: IteratorDateUtils.iter_business_days(df, 'order_date', 'delivery_date'),
+                               repeat=1)
+        rows_time = _timeit(lambda: IteratorDateUtils.business_days_between_rows(df, 'order_date'), repeat=1)
+        print(f"business days rows={n:,}: apply~{apply_time * n:.0f}s (extrapolated from {apply_rows:,} rows) "
+              f"iter_business_days={between_time:.3f}s business_days_between_rows={rows_time:.3f}s "
+              f"speedup~{apply_time * n / between_time:.0f}x")
+
+
+def benchmark_holiday_calendar(n=10 ** 6, offset_rows=20_000):
+    """Holiday-aware offsets, checks and counts: BusinessCalendar lookups vs pandas CustomBusinessDay."""
+    holidays = pd.to_datetime(['2024-01-01', '2024-05-27', '2024-07-04', '2024-09-02', '2024-11-28', '2024-12-25'])
+    holidays = [date + pd.DateOffset(years=year) for year in range(-10, 2) for date in holidays]
+    calendar = BusinessCalendar(holidays)
+    df = _order_frame(n)
+    sample = df['order_date'].iloc[:offset_rows]
+
+    def custom_business_day():
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # pandas warns that the offset is applied row by row
+            sample + CustomBusinessDay(3, holidays=holidays)
+
+    custom_time = _timeit(custom_business_day, repeat=1) / offset_rows
+    offset_time = _timeit(lambda: IteratorDateUtils.add_business_days(df, 'order_date', 3, calendar=calendar), repeat=1)
+    check_time = _timeit(lambda: IteratorDateUtils.is_business_day(df, 'order_date', calendar=calendar), repeat=1)
+    count_time = _timeit(lambda: IteratorDateUtils.iter_business_days(df, 'order_date', 'delivery_date',
+                                                                      calendar=calendar), repeat=1)
+    print(f"holiday calendar rows={n:,}: CustomBusinessDay~{custom_time * n:.1f}s (extrapolated from "
+          f"{offset_rows:,} rows) calendar offset={offset_time:.3f}s is_business_day={check_time:.3f}s "
+          f"business days between={count_time:.3f}s")
+
+
+def benchmark_string_dates(n=10 ** 7):
+    """ORDERDATE-style string columns vs datetime64 columns, and the cost of the former double parse."""
+    df = _order_frame(n)
+    # Format the distinct hours once and gather them, strftime over 10^7 rows would dominate the setup
+    codes, hours = pd.factorize(df['order_date'])
+    strings = pd.DataFrame({'order_date': pd.Series(hours.strftime('%m/%d/%Y %H:%M'))[codes].reset_index(drop=True)})
+
+    def double_parse():
+        # What each call did before: validate by parsing, discard, parse again
+        pd.to_datetime(strings['order_date'])
+        return pd.to_datetime(strings['order_date'])
+
+    double_time = _timeit(double_parse, repeat=1)
+    string_time = _timeit(lambda: IteratorDateUtils.business_days_between_rows(strings.copy(), 'order_date'), repeat=1)
+    parsed_time = _timeit(lambda: IteratorDateUtils.business_days_between_rows(df.copy(), 'order_date'), repeat=1)
+    print(f"date parsing rows={n:,}: former double parse={double_time:.3f}s "
+          f"business_days_between_rows on strings={string_time:.3f}s on datetime64={parsed_time:.3f}s")
+
+
+def benchmark_weekdays(sizes=(10 ** 6, 10 ** 7), apply_rows=10 ** 6):
+    """Weekday checks and names: a lambda per row vs .dt.dayofweek, and string vs categorical names."""
+    sample = _order_frame(apply_rows)
+    apply_time = _timeit(lambda: sample['order_date'].apply(lambda x: x.weekday() < 5), repeat=1) / apply_rows
+    for n in sizes:
+        df = _order_frame(n)
+        check_time = _timeit(lambda: IteratorDateUtils.is_business_day(df.copy(), 'order_date'), repeat=1)
+        names = IteratorDateUtils.weekday_name(df.copy(), 'order_date')['weekday_name']
+        categories = IteratorDateUtils.weekday_name(df.copy(), 'order_date', categorical=True)['weekday_name']
+        names_time = _timeit(lambda: IteratorDateUtils.weekday_name(df.copy(), 'order_date'), repeat=1)
+        categories_time = _timeit(lambda: IteratorDateUtils.weekday_name(df.copy(), 'order_date', categorical=True),
+                                  repeat=1)
+        print(f"weekdays rows={n:,}: apply~{apply_time * n:.2f}s is_business_day={check_time:.3f}s | "
+              f"weekday names {names_time:.3f}s {names.memory_usage(deep=True) / 2 ** 20:.0f} MiB, "
+              f"categorical {categories_time:.3f}s {categories.memory_usage(deep=True) / 2 ** 20:.0f} MiB")
+
+
+def benchmark_chunked_enrichment(n=2 * 10 ** 6, chunksize=100_000):
+    """Date enrichments over a CSV file: the whole file in memory vs chunks streamed through iter_enrich."""
+    enrichments = [
+        {'enrichment': 'business_days_between_rows', 'date_column': 'order_date'},
+        {'enrichment': 'business_days', 'start_date_col': 'order_date', 'end_date_col': 'delivery_date'},
+        {'enrichment': 'next_working_day', 'date_column': 'order_date'},
+        {'enrichment': 'weekday_name', 'date_col': 'order_date', 'categorical': True}
+    ]
+
+    def whole_file(path):
+        df = pd.read_csv(path)
+        df = IteratorDateUtils.business_days_between_rows(df, 'order_date')
+        df = IteratorDateUtils.iter_business_days(df, 'order_date', 'delivery_date')
+        df = IteratorDateUtils.iter_next_working_day(df, 'order_date')
+        return IteratorDateUtils.weekday_name(df, 'order_date', categorical=True)
+
+    def chunked(path):
+        rows = 0
+        for chunk in IteratorDateUtils.iter_enrich(pd.read_csv(path, chunksize=chunksize), enrichments):
+            rows += len(chunk)  # a pipeline would write the chunk out here
+        return rows
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'orders.csv')
+        _order_frame(n).to_csv(path, index=False, date_format='%Y-%m-%d %H:%M:%S')
+        size = os.path.getsize(path)
+        for name, func in (('whole file', whole_file), (f'chunks of {chunksize:,}', chunked)):
+            elapsed = _timeit(lambda: func(path), repeat=1)
+            tracemalloc.start()
+            func(path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"date enrichment rows={n:,} csv={size / 2 ** 20:.0f} MiB {name}: {elapsed:.3f}s "
+                  f"peak={peak / 2 ** 20:.0f} MiB")
+
+
+def _python_fiscal_fields(date, start_month=4):
+    """Fiscal year, quarter, period and week of one date, computed in Python (fiscal year labelled by its end)."""
+    start_year = date.year - (date.month < start_month)
+    period = (date.month - start_month) % 12 + 1
+    week = (date - pd.Timestamp(start_year, start_month, 1)).days // 7 + 1
+    return start_year + 1, (period - 1) // 3 + 1, period, week
+
+
+def benchmark_fiscal_periods(sizes=(10 ** 6, 10 ** 7), python_rows=100_000):
+    """Fiscal fields per row in Python vs one gather from the FiscalCalendar lookup table."""
+    sample = _order_frame(python_rows)['order_date']
+    python_time = _timeit(lambda: [_python_fiscal_fields(date) for date in sample], repeat=1) / python_rows
+    build_time = _timeit(lambda: FiscalCalendar(start_month=4))
+    retail = FiscalCalendar(start_month=2, pattern='4-5-4', variation='nearest')
+    for n in sizes:
+        df = _order_frame(n)
+        month_time = _timeit(lambda: IteratorDateUtils.fiscal_periods(df.copy(), 'order_date',
+                                                                      FiscalCalendar(start_month=4)), repeat=1)
+        retail_time = _timeit(lambda: IteratorDateUtils.fiscal_periods(df.copy(), 'order_date', retail), repeat=1)
+        print(f"fiscal periods rows={n:,}: python~{python_time * n:.1f}s (extrapolated from {python_rows:,} rows) "
+              f"month based={month_time:.3f}s 4-5-4={retail_time:.3f}s (table build {build_time * 1e3:.1f}ms)")
+
+
+def main():
+    benchmark_business_days()
+    benchmark_holiday_calendar()
+    benchmark_string_dates()
+    benchmark_weekdays()
+    benchmark_chunked_enrichment()
+    benchmark_fiscal_periods()
+
+
+if __name__ == "__main__":
+    main()
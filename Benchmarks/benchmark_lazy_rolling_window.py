@@ -0,0 +1,160 @@
+import sys
+import os
+current_directory = os.getcwd()
+main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
+sys.path.insert(0, main_directory_path)
+
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from biztools.lazy_rolling_window import LazyRollingWindow, StreamingRollingWindow, KeyedRollingWindow, TimeRollingWindow
+
+
+def _timeit(func, repeat=3):
+    """Returns the best wall-clock time of `repeat` runs of func."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_incremental_window(n=100_000, window_sizes=(10, 100, 1_000)):
+    """Slides across n points reading every statistic, incremental state vs recomputing each slice."""
+    data = np.random.default_rng(42).uniform(0, 1000, size=n).tolist()
+    for window_size in window_sizes:
+        def recompute():
+            for start in range(n - window_size + 1):
+                window_data = data[start:start + window_size]
+                sum(window_data), sum(window_data) / window_size, np.std(window_data)
+                max(window_data), min(window_data)
+
+        def incremental():
+            window = LazyRollingWindow(data, window_size)
+            for _ in range(n - window_size + 1):
+                window.get_window_sum(), window.get_window_avg(), window.get_window_std_dev()
+                window.get_max_of_window(), window.get_min_of_window()
+                window.next_window()
+
+        recompute_time = _timeit(recompute, repeat=1)
+        incremental_time = _timeit(incremental, repeat=1)
+        print(f"sliding window n={n:,} window={window_size:,}: recompute={recompute_time:.3f}s "
+              f"incremental={incremental_time:.3f}s speedup={recompute_time / incremental_time:.1f}x")
+
+
+def benchmark_compute_all_windows(n=100_000, window_size=30):
+    """Compares compute_all_windows with looping next_window() and calling every getter."""
+    data = np.random.default_rng(42).uniform(0, 1000, size=n).tolist()
+
+    def step_by_step():
+        window = LazyRollingWindow(data, window_size)
+        for _ in range(n - window_size + 1):
+            window.get_window_sum(), window.get_window_avg(), window.get_window_std_dev()
+            window.get_max_of_window(), window.get_min_of_window()
+            window.detect_outliers(), window.detect_seasonality()
+            window.next_window()
+
+    def vectorized():
+        LazyRollingWindow(data, window_size).compute_all_windows()
+
+    loop_time = _timeit(step_by_step, repeat=1)
+    vectorized_time = _timeit(vectorized)
+    print(f"all windows n={n:,} window={window_size}: loop={loop_time:.3f}s "
+          f"vectorized={vectorized_time:.3f}s speedup={loop_time / vectorized_time:.1f}x")
+
+
+def benchmark_rolling_outliers(n=20_000, window_sizes=(30, 300, 3_000)):
+    """Streams the IQR outliers of every window, rolling sorted window vs np.percentile on each slice."""
+    data = np.random.default_rng(42).standard_t(3, size=n).tolist()
+    for window_size in window_sizes:
+        def percentile_per_slice():
+            for start in range(n - window_size + 1):
+                window_data = data[start:start + window_size]
+                q1, q3 = np.percentile(window_data, [25, 75])
+                iqr = q3 - q1
+                [x for x in window_data if x < q1 - 1.5 * iqr or x > q3 + 1.5 * iqr]
+
+        def rolling():
+            for _ in LazyRollingWindow(data, window_size).iter_outliers():
+                pass
+
+        slice_time = _timeit(percentile_per_slice, repeat=1)
+        rolling_time = _timeit(rolling, repeat=1)
+        print(f"rolling outliers n={n:,} window={window_size:,}: percentile={slice_time:.3f}s "
+              f"rolling={rolling_time:.3f}s speedup={slice_time / rolling_time:.1f}x")
+
+
+def benchmark_keyed_windows(n_keys=100_000, window_size=10, n_events=1_000_000):
+    """Feeds (key, value) events to one KeyedRollingWindow vs one StreamingRollingWindow per key."""
+    rng = np.random.default_rng(42)
+    keys = rng.integers(0, n_keys, size=n_events).tolist()
+    values = rng.uniform(0, 1000, size=n_events).tolist()
+
+    def per_key_objects():
+        windows = {}
+        for key, value in zip(keys, values):
+            window = windows.get(key)
+            if window is None:
+                windows[key] = StreamingRollingWindow([value], window_size)
+            else:
+                window.push(value)
+        return windows
+
+    def keyed():
+        window = KeyedRollingWindow(window_size)
+        window.update(zip(keys, values))
+        return window
+
+    for name, func in (('per-key objects', per_key_objects), ('keyed store', keyed)):
+        elapsed = _timeit(func, repeat=1)
+        # Memory is measured on a separate run, tracemalloc slows down allocations
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"keyed windows keys={n_keys:,} window={window_size} events={n_events:,} {name}: "
+              f"{elapsed:.3f}s peak={peak / 2 ** 20:.1f} MiB")
+
+
+def benchmark_time_window(scale=20, window='30D'):
+    """Streams the sales orders (repeated `scale` times) through a 30-day event-time window, vs recomputing
+    each window from the orders of the last 30 days."""
+    sales = pd.read_csv(os.path.join(main_directory_path, 'Biztools on Sales data', 'sales_data.csv'),
+                        encoding='ISO-8859-1')
+    sales = pd.concat([sales] * scale, ignore_index=True)
+    sales['ORDERDATE'] = pd.to_datetime(sales['ORDERDATE'])
+    sales = sales.sort_values('ORDERDATE', kind='stable')
+    timestamps = sales['ORDERDATE'].tolist()
+    values = sales['SALES'].tolist()
+    span = pd.Timedelta(window)
+
+    def recompute():
+        order_dates = sales['ORDERDATE'].values
+        order_sales = sales['SALES'].values
+        starts = np.searchsorted(order_dates, (sales['ORDERDATE'] - span).values, side='right')
+        for end in range(len(order_sales)):
+            window_data = order_sales[starts[end]:end + 1]
+            window_data.sum(), window_data.std(), window_data.max(), window_data.min()
+
+    def incremental():
+        for _ in TimeRollingWindow(window, allowed_lateness='1D').iter_windows(zip(timestamps, values)):
+            pass
+
+    recompute_time = _timeit(recompute, repeat=1)
+    incremental_time = _timeit(incremental, repeat=1)
+    print(f"time window rows={len(values):,} window={window}: recompute={recompute_time:.3f}s "
+          f"incremental={incremental_time:.3f}s speedup={recompute_time / incremental_time:.1f}x")
+
+
+def main():
+    benchmark_incremental_window()
+    benchmark_compute_all_windows()
+    benchmark_rolling_outliers()
+    benchmark_keyed_windows()
+    benchmark_time_window()
+
+
+if __name__ == "__main__":
+    main()
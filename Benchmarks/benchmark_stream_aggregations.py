@@ -0,0 +1,120 @@
+import sys
+import os
+current_directory = os.getcwd()
+main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
+sys.path.insert(0, main_directory_path)
+
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from biztools.stream_aggregations import StreamAggregations
+
+
+def _timeit(func, repeat=3):
+    """Returns the best wall-clock time of `repeat` runs of func."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _sample_frame(n_rows, n_groups, seed=42):
+    """Builds a frame with a string group column and a numeric value column."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'store': rng.integers(0, n_groups, size=n_rows).astype(str),
+        'sales': rng.uniform(1000, 5000, size=n_rows)
+    })
+
+
+def benchmark_multi_aggregate(n_rows=1_000_000, n_groups=1_000):
+    """Compares stream_group_agg with calling the dashboard methods one at a time."""
+    df = _sample_frame(n_rows, n_groups)
+
+    def one_at_a_time():
+        StreamAggregations.stream_group_count(df, ['store'], 'sales')
+        StreamAggregations.stream_group_sum(df, ['store'], 'sales')
+        StreamAggregations.stream_group_min_max(df, ['store'], 'sales')
+        StreamAggregations.stream_group_std_var(df, ['store'], 'sales')
+        StreamAggregations.stream_group_mean_median(df, ['store'], 'sales')
+
+    def single_call():
+        StreamAggregations.stream_group_agg(
+            df, ['store'], 'sales', ['count', 'sum', 'min', 'max', 'std', 'var', 'mean', 'median']
+        )
+
+    separate = _timeit(one_at_a_time)
+    fused = _timeit(single_call)
+    print(f"multi-aggregate rows={n_rows:,} groups={n_groups:,}: "
+          f"separate={separate:.3f}s single={fused:.3f}s speedup={separate / fused:.1f}x")
+
+
+def benchmark_group_mad(n_rows=1_000_000, n_groups=200_000):
+    """Compares the vectorized group MAD with a per-group Python lambda on high-cardinality keys."""
+    df = _sample_frame(n_rows, n_groups)
+
+    def per_group_lambda():
+        df.groupby(['store']).agg(mad=('sales', lambda x: (abs(x - x.mean())).mean()))
+
+    def vectorized():
+        StreamAggregations.stream_group_mad(df, ['store'], 'sales')
+
+    python_time = _timeit(per_group_lambda, repeat=1)
+    vectorized_time = _timeit(vectorized)
+    print(f"group MAD rows={n_rows:,} groups={n_groups:,}: "
+          f"lambda={python_time:.3f}s vectorized={vectorized_time:.3f}s speedup={python_time / vectorized_time:.1f}x")
+
+
+def _peak_memory(func):
+    """Returns the peak memory allocated while running func, in MiB."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def _sales_frame(scale):
+    """Loads the sales dataset and repeats it `scale` times."""
+    path = os.path.join(main_directory_path, 'Biztools on Sales data', 'sales_data.csv')
+    sales = pd.read_csv(path, usecols=['YEAR_ID', 'QTR_ID', 'MONTH_ID', 'SALES'], encoding='ISO-8859-1')
+    return pd.concat([sales] * scale, ignore_index=True)
+
+
+def benchmark_native_keys(scale=1_000):
+    """Compares string-cast and native group keys on the sales dataset scaled `scale` times."""
+    df = _sales_frame(scale)
+    group_columns = ['YEAR_ID', 'QTR_ID', 'MONTH_ID']
+    for native_keys in (False, True):
+        def run():
+            StreamAggregations.stream_group_sum(df, group_columns, 'SALES', native_keys=native_keys)
+        elapsed = _timeit(run)
+        peak = _peak_memory(run)
+        print(f"sales x{scale:,} ({len(df):,} rows) native_keys={native_keys}: "
+              f"time={elapsed:.3f}s peak_memory={peak:.1f}MiB")
+
+
+def benchmark_parallel_scaling(n_rows=10_000_000, n_groups=100_000, workers=(1, 2, 4, 8, 16)):
+    """Measures stream_group_agg across process pool sizes (values and codes shared, not pickled)."""
+    df = _sample_frame(n_rows, n_groups)
+    metrics = ['count', 'sum', 'mean', 'median', 'std', 'mad']
+    baseline = None
+    for n_jobs in workers:
+        elapsed = _timeit(lambda: StreamAggregations.stream_group_agg(df, ['store'], 'sales', metrics, n_jobs=n_jobs), repeat=1)
+        baseline = baseline or elapsed
+        print(f"parallel rows={n_rows:,} groups={n_groups:,} n_jobs={n_jobs}: "
+              f"time={elapsed:.3f}s speedup={baseline / elapsed:.1f}x")
+
+
+def main():
+    benchmark_multi_aggregate()
+    benchmark_group_mad()
+    benchmark_native_keys()
+    benchmark_parallel_scaling()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import sys
+import os
+current_directory = os.getcwd()
+main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
+sys.path.insert(0, main_directory_path)
+
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from biztools.stream_kpi_calculations import StreamKpiCalculations, IncrementalKpiCalculator
+
+
+def _timeit(func, repeat=3):
+    """Returns the best wall-clock time of `repeat` runs of func."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_streaming_revenue_growth(n=100_000, batch_size=100):
+    """Per-event cost of the revenue growth generator, vs rebuilding a DataFrame for every arriving record."""
+    revenue = np.random.default_rng(42).uniform(100, 10_000, size=n)
+    records = [{'revenue': value} for value in revenue.tolist()]
+    batches = [pd.DataFrame({'revenue': revenue[i:i + batch_size]}) for i in range(0, n, batch_size)]
+
+    def rebuild_per_event(events=1_000):
+        # Recomputing on the last two rows is the cheapest way to get each new value with the frame API
+        for i in range(1, events):
+            StreamKpiCalculations.stream_revenue_growth(records[i - 1:i + 1], 'revenue')
+
+    def per_record():
+        for _ in StreamKpiCalculations.iter_revenue_growth(records, 'revenue'):
+            pass
+
+    def per_batch():
+        for _ in StreamKpiCalculations.iter_revenue_growth(batches, 'revenue'):
+            pass
+
+    rebuild_time = _timeit(rebuild_per_event, repeat=1) / 1_000
+    record_time = _timeit(per_record) / n
+    batch_time = _timeit(per_batch) / n
+    print(f"revenue growth per event: frame rebuild={rebuild_time * 1e6:.1f}us generator={record_time * 1e6:.2f}us "
+          f"micro-batches of {batch_size}={batch_time * 1e6:.2f}us")
+
+
+def benchmark_grouped_revenue_growth(n_groups=100_000, rows_per_group=10, loop_groups=2_000):
+    """Revenue growth per customer: one vectorized pass vs looping over groupby groups in Python."""
+    rng = np.random.default_rng(42)
+    n = n_groups * rows_per_group
+    df = pd.DataFrame({
+        'customer': rng.integers(0, n_groups, size=n),
+        'month': rng.integers(0, 36, size=n),
+        'revenue': rng.uniform(100, 10_000, size=n)
+    })
+
+    def python_loop(frame):
+        parts = [StreamKpiCalculations.stream_revenue_growth(group.sort_values('month', kind='stable'), 'revenue')
+                 for _, group in frame.groupby('customer')]
+        return pd.concat(parts)
+
+    def vectorized():
+        StreamKpiCalculations.stream_revenue_growth(df.copy(), 'revenue', group_cols='customer', order_col='month')
+
+    def pandas_groupby():
+        ordered = df.sort_values('month', kind='stable')
+        (ordered.groupby('customer')['revenue'].pct_change() * 100).round(2).reindex(df.index)
+
+    # The loop is timed on a subset of the groups, its cost is linear in the number of groups
+    subset = df[df['customer'] < loop_groups]
+    loop_time = _timeit(lambda: python_loop(subset), repeat=1) / loop_groups
+    vectorized_time = _timeit(vectorized)
+    pandas_time = _timeit(pandas_groupby)
+    print(f"grouped revenue growth groups={n_groups:,} rows={n:,}: python loop={loop_time * 1e6:.0f}us/group "
+          f"(~{loop_time * n_groups:.0f}s in total) vectorized={vectorized_time:.3f}s "
+          f"groupby pct_change={pandas_time:.3f}s")
+
+
+def benchmark_grouped_churn_rate(n_groups=100_000, rows_per_group=10):
+    """Per-group churn rate over time from one sort of the frame."""
+    rng = np.random.default_rng(42)
+    n = n_groups * rows_per_group
+    df = pd.DataFrame({
+        'territory': rng.integers(0, n_groups, size=n),
+        'month': rng.integers(0, 36, size=n),
+        'start_customers': rng.integers(100, 1_000, size=n),
+        'end_customers': rng.integers(100, 1_000, size=n)
+    })
+    elapsed = _timeit(lambda: StreamKpiCalculations.stream_group_churn_rate(
+        df, 'territory', 'start_customers', 'end_customers', order_col='month'))
+    print(f"grouped churn rate groups={n_groups:,} rows={n:,}: {elapsed:.3f}s")
+
+
+def benchmark_fused_kpis(n=200_000, n_columns=300):
+    """Adds three KPIs to a wide fact table: chained single-KPI calls vs one fused call."""
+    rng = np.random.default_rng(42)
+    wide = pd.DataFrame(rng.uniform(0, 1, size=(n, n_columns)), columns=[f'measure_{i}' for i in range(n_columns)])
+    kpi_columns = pd.DataFrame({
+        'revenue': rng.uniform(100, 10_000, size=n),
+        'start_customers': rng.integers(100, 1_000, size=n),
+        'end_customers': rng.integers(100, 1_000, size=n)
+    })
+    fact_table = pd.concat([wide, kpi_columns], axis=1)
+    kpis = [
+        {'kpi': 'revenue_growth', 'revenue_col': 'revenue'},
+        {'kpi': 'churn_rate', 'start_col': 'start_customers', 'end_col': 'end_customers'},
+        {'kpi': 'growth_rate', 'start_col': 'start_customers', 'end_col': 'end_customers'}
+    ]
+
+    def chained():
+        df = fact_table.copy(deep=False)  # new columns do not reach fact_table, no data is copied
+        StreamKpiCalculations.stream_revenue_growth(df, 'revenue')
+        StreamKpiCalculations.stream_churn_rate(df, 'start_customers', 'end_customers')
+        StreamKpiCalculations.stream_growth_rate(df, 'start_customers', 'end_customers')
+        return df
+
+    def arrays():
+        StreamKpiCalculations.stream_revenue_growth(fact_table, 'revenue', output='array')
+        StreamKpiCalculations.stream_churn_rate(fact_table, 'start_customers', 'end_customers', output='array')
+        StreamKpiCalculations.stream_growth_rate(fact_table, 'start_customers', 'end_customers', output='array')
+
+    def fused():
+        return StreamKpiCalculations.stream_kpis(fact_table, kpis)
+
+    for name, func in (('chained frame', chained), ('array outputs', arrays), ('fused', fused)):
+        elapsed = _timeit(func)
+        tracemalloc.start()
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        blocks = f" blocks={result._mgr.nblocks}" if result is not None else ""
+        print(f"kpi batch rows={n:,} columns={n_columns} {name}: {elapsed:.3f}s peak={peak / 2 ** 20:.1f} MiB{blocks}")
+
+
+def benchmark_incremental_daily_run(n_days=365, rows_per_day=20_000, n_customers=50_000):
+    """A daily job after a year of history: recompute over the full history vs resume from a snapshot."""
+    rng = np.random.default_rng(42)
+    n = n_days * rows_per_day
+    history = pd.DataFrame({
+        'day': np.repeat(np.arange(n_days), rows_per_day),
+        'customer': rng.integers(0, n_customers, size=n),
+        'revenue': rng.uniform(100, 10_000, size=n),
+        'start_customers': rng.integers(100, 1_000, size=n),
+        'end_customers': rng.integers(100, 1_000, size=n)
+    })
+    today = history[history['day'] == n_days - 1]
+
+    def full_recompute():
+        StreamKpiCalculations.stream_revenue_growth(history, 'revenue', group_cols='customer', order_col='day',
+                                                    output='array')
+        StreamKpiCalculations.stream_group_churn_rate(history, 'customer', 'start_customers', 'end_customers',
+                                                      order_col='day')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kpi_state.json')
+        calculator = IncrementalKpiCalculator('revenue', 'start_customers', 'end_customers',
+                                              group_cols='customer', order_col='day')
+        calculator.update(history[history['day'] < n_days - 1], output='array')
+        calculator.save(path)
+        snapshot_size = os.path.getsize(path)
+
+        def incremental():
+            resumed = IncrementalKpiCalculator.load(path)
+            resumed.update(today, output='array')
+            resumed.churn_rates()
+
+        full_time = _timeit(full_recompute)
+        incremental_time = _timeit(incremental)
+    print(f"daily kpi run history={n:,} rows today={len(today):,} rows: full recompute={full_time:.3f}s "
+          f"resume from snapshot={incremental_time:.3f}s (snapshot {snapshot_size / 2 ** 20:.1f} MiB)")
+
+
+def main():
+    benchmark_streaming_revenue_growth()
+    benchmark_grouped_revenue_growth()
+    benchmark_grouped_churn_rate()
+    benchmark_fused_kpis()
+    benchmark_incremental_daily_run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import sys
+import os
+current_directory = os.getcwd()
+main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
+sys.path.insert(0, main_directory_path)
+
+
+import unittest
+import tempfile
+import pandas as pd
+import numpy as np
+from pandas.tseries.offsets import CustomBusinessDay
+from biztools.business_calendar import BusinessCalendar
+
+class TestBusinessCalendar(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(42)
+        self.holidays = ['2024-12-25', '2024-12-26', '2025-01-01']
+        self.calendar = BusinessCalendar(self.holidays)
+        self.dates = pd.Series(pd.Timestamp('2024-12-01') + pd.to_timedelta(np.random.randint(0, 60 * 24, size=200), unit='h'))
+
+    # ==========================
+    # Valid input tests
+    # ==========================
+
+    def test_offset_matches_custom_business_day(self):
+        # Offsets keep the time of day and skip weekends and holidays like CustomBusinessDay
+        for num_days in (1, 2, 10, -1, -7):
+            expected = [date + CustomBusinessDay(num_days, holidays=self.holidays) for date in self.dates]
+            result = self.calendar.offset(self.dates, num_days)
+            self.assertEqual(list(pd.to_datetime(result)), expected, f"Failed for {num_days} business days")
+
+    def test_offset_outside_index(self):
+        # Dates and offsets beyond the precomputed span extend the index
+        calendar = BusinessCalendar(self.holidays, start='2024-12-01', end='2024-12-31')
+        dates = pd.Series(pd.to_datetime(['2024-12-24', '2030-06-14']))
+        result = pd.to_datetime(calendar.offset(dates, 300))
+        expected = [date + CustomBusinessDay(300, holidays=self.holidays) for date in dates]
+        self.assertEqual(list(result), expected)
+
+    def test_count_matches_bdate_range(self):
+        ends = self.dates + pd.to_timedelta(np.random.randint(-5, 30, size=len(self.dates)), unit='D')
+        result = self.calendar.count(self.dates, ends)
+        expected = [len(pd.bdate_range(start, end, freq='C', holidays=self.holidays)) - 1
+                    for start, end in zip(self.dates, ends)]
+        self.assertEqual(result.tolist(), expected)
+
+    def test_is_business_day(self):
+        dates = pd.Series(pd.to_datetime(['2024-12-24', '2024-12-25', '2024-12-28', None]))
+        self.assertEqual(self.calendar.is_business_day(dates).tolist(), [True, False, False, False])
+
+    def test_weekmask(self):
+        # A Sunday-to-Thursday week
+        calendar = BusinessCalendar(weekmask='Sun Mon Tue Wed Thu')
+        dates = pd.Series(pd.to_datetime(['2024-12-26', '2024-12-27', '2024-12-29']))
+        self.assertEqual(calendar.is_business_day(dates).tolist(), [True, False, True])
+        self.assertEqual(list(pd.to_datetime(calendar.offset(dates[:1], 1))), [pd.Timestamp('2024-12-29')])
+
+    def test_missing_dates(self):
+        dates = pd.Series(pd.to_datetime(['2024-12-24', None]))
+        self.assertTrue(pd.isna(self.calendar.offset(dates, 1)[1]))
+        counts = self.calendar.count(dates, dates)
+        self.assertEqual(counts[0], 0)
+        self.assertTrue(np.isnan(counts[1]))
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'holidays.csv')
+            pd.DataFrame({
+                'country': ['US', 'US', 'FR'],
+                'date': ['2024-07-04', '2024-12-25', '2024-07-14']
+            }).to_csv(path, index=False)
+            calendar = BusinessCalendar.from_file(path, country='US')
+            self.assertEqual(calendar.holidays.tolist(), list(np.array(['2024-07-04', '2024-12-25'], dtype='datetime64[D]')))
+            single = os.path.join(directory, 'fr.txt')
+            with open(single, 'w') as file:
+                file.write("2024-07-14\n2024-08-15\n")
+            self.assertEqual(len(BusinessCalendar.from_file(single).holidays), 2)
+
+    # ==========================
+    # Invalid input tests
+    # ==========================
+
+    def test_invalid_holidays(self):
+        with self.assertRaises(ValueError):
+            BusinessCalendar(['not a date'])
+
+    def test_invalid_weekmask(self):
+        with self.assertRaises(ValueError):
+            BusinessCalendar(weekmask='Funday')
+        with self.assertRaises(ValueError):
+            BusinessCalendar(weekmask='0000000')
+
+def main():
+    unittest.main(argv=['first-arg-is-ignored'], exit=False, verbosity=3)
+
+if __name__ == "__main__":
+    main()
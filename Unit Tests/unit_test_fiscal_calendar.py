@@ -0,0 +1,118 @@
+import sys
+import os
+current_directory = os.getcwd()
+main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
+sys.path.insert(0, main_directory_path)
+
+
+import unittest
+import pandas as pd
+import numpy as np
+from pandas.tseries.offsets import FY5253
+from biztools.fiscal_calendar import FiscalCalendar
+from biztools.iterator_date_utils import IteratorDateUtils
+from biztools.stream_aggregations import StreamAggregations
+
+class TestFiscalCalendar(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(42)
+        self.dates = pd.Series(pd.date_range('2015-01-01', '2030-12-31', freq='D'))
+
+    # ==========================
+    # Valid input tests
+    # ==========================
+
+    def test_month_based_matches_periods(self):
+        # A fiscal year starting in April matches pandas' quarters ending in March
+        fields = FiscalCalendar(start_month=4).lookup(self.dates)
+        periods = pd.PeriodIndex(self.dates, freq='Q-MAR')
+        self.assertTrue((fields[:, 0] == periods.qyear).all())
+        self.assertTrue((fields[:, 1] == periods.quarter).all())
+        self.assertTrue((fields[:, 2] == (self.dates.dt.month - 4) % 12 + 1).all())
+        self.assertEqual(fields[:, 3].min(), 1)
+        self.assertEqual(fields[:, 3].max(), 53)
+
+    def test_calendar_year(self):
+        fields = FiscalCalendar().lookup(self.dates)
+        self.assertTrue((fields[:, 0] == self.dates.dt.year).all())
+        self.assertTrue((fields[:, 1] == self.dates.dt.quarter).all())
+        self.assertTrue((fields[:, 2] == self.dates.dt.month).all())
+        self.assertTrue((fields[:, 3] == (self.dates.dt.dayofyear - 1) // 7 + 1).all())
+
+    def test_year_label(self):
+        dates = pd.Series(pd.to_datetime(['2024-03-31', '2024-04-01']))
+        self.assertEqual(FiscalCalendar(4).lookup(dates)[:, 0].tolist(), [2024, 2025])
+        self.assertEqual(FiscalCalendar(4, year_label='start').lookup(dates)[:, 0].tolist(), [2023, 2024])
+
+    def test_retail_calendar(self):
+        # 4-5-4 retail calendar ending on the Saturday nearest the end of January, labelled by its start year
+        calendar = FiscalCalendar(start_month=2, pattern='4-5-4', week_end='Sat', variation='nearest',
+                                  year_label='start')
+        dates = pd.Series(pd.to_datetime(['2023-01-28', '2023-01-29', '2023-02-25', '2023-02-26',
+                                          '2023-04-30', '2024-02-03', '2024-02-04']))
+        expected = [[2022, 4, 12, 52], [2023, 1, 1, 1], [2023, 1, 1, 4], [2023, 1, 2, 5],
+                    [2023, 2, 4, 14], [2023, 4, 12, 53], [2024, 1, 1, 1]]
+        self.assertEqual(calendar.lookup(dates).tolist(), expected)
+
+    def test_week_based_year_ends(self):
+        # Every fiscal year starts the day after a FY5253 year end and has 52 or 53 weeks of 4-4-5 periods
+        calendar = FiscalCalendar(start_month=1, pattern=(4, 4, 5), week_end='Sat')
+        fields = calendar.lookup(self.dates)
+        starts = self.dates[fields[:, 3] != np.roll(fields[:, 3], 1)]
+        year_starts = self.dates[(fields[:, 0] != np.roll(fields[:, 0], 1))].iloc[1:]
+        offset = FY5253(weekday=5, startingMonth=12, variation='last')
+        self.assertTrue(all(offset.is_on_offset(date - pd.Timedelta(days=1)) for date in year_starts))
+        self.assertTrue((starts.iloc[1:].diff().dropna() == pd.Timedelta(days=7)).all())
+        weeks_per_period = pd.Series(fields[:, 3]).groupby([fields[:, 0], fields[:, 2]]).nunique()
+        self.assertEqual(weeks_per_period.loc[2017].tolist(), [4, 4, 5] * 4)
+        # 2016 ends on Saturday 2016-12-31 and has 53 weeks, the extra week goes to the last period
+        self.assertEqual(weeks_per_period.loc[2016].tolist(), [4, 4, 5] * 3 + [4, 4, 6])
+
+    def test_missing_and_out_of_range_dates(self):
+        calendar = FiscalCalendar(start='2024-01-01', end='2024-12-31')
+        fields = calendar.lookup(pd.Series(pd.to_datetime(['1950-06-15', None, '2250-01-01'])))
+        self.assertEqual(fields[0].tolist(), [1950, 2, 6, 24])
+        self.assertTrue(np.isnan(fields[1]).all())
+        self.assertEqual(fields[2].tolist(), [2250, 1, 1, 1])
+
+    def test_fiscal_periods_group_keys(self):
+        # The fiscal columns group directly with StreamAggregations
+        df = pd.DataFrame({
+            'order_date': ['03/30/2024 10:00', '04/02/2024 09:30', '04/20/2024 18:00', '07/01/2024 08:00'],
+            'sales': [100.0, 200.0, 300.0, 400.0]
+        })
+        result = IteratorDateUtils.fiscal_periods(df, 'order_date', FiscalCalendar(start_month=4),
+                                                  fields=['year', 'quarter'])
+        self.assertEqual(result['fiscal_year'].tolist(), [2024, 2025, 2025, 2025])
+        self.assertNotIn('fiscal_week', result.columns)
+        totals = StreamAggregations.stream_group_sum(result, ['fiscal_year', 'fiscal_quarter'], 'sales',
+                                                     native_keys=True)
+        self.assertEqual(totals['sum'].tolist(), [100.0, 500.0, 400.0])
+
+    # ==========================
+    # Invalid input tests
+    # ==========================
+
+    def test_invalid_calendar_options(self):
+        with self.assertRaises(ValueError):
+            FiscalCalendar(start_month=13)
+        with self.assertRaises(ValueError):
+            FiscalCalendar(pattern='4-4-4')
+        with self.assertRaises(ValueError):
+            FiscalCalendar(pattern='4-4-5', week_end='Friday')
+        with self.assertRaises(ValueError):
+            FiscalCalendar(year_label='middle')
+
+    def test_invalid_fiscal_periods_input(self):
+        df = pd.DataFrame({'order_date': pd.date_range('2024-01-01', periods=3)})
+        with self.assertRaises(ValueError):
+            IteratorDateUtils.fiscal_periods(df, 'order_date', fiscal_calendar=4)
+        with self.assertRaises(ValueError):
+            IteratorDateUtils.fiscal_periods(df, 'order_date', fields=['month'])
+
+def main():
+    unittest.main(argv=['first-arg-is-ignored'], exit=False, verbosity=3)
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
 sys.path.insert(0, main_directory_path)
 
 import unittest
-from biztools.iterable_statistics import IterableStatistics
+import array
+import numpy as np
+import pandas as pd
+from biztools.iterable_statistics import IterableStatistics, OnlineAccumulator
 
 class TestIterableStatistics(unittest.TestCase):
 
@@ -27,6 +30,14 @@ class TestIterableStatistics(unittest.TestCase):
     # Test for iterable_mean_median method
     def test_iterable_mean_median_valid_input(self):
         self.assertEqual(IterableStatistics.iterable_mean_median([1, 2, 3, 4, 5]), (3.0, 3))  # Mean and median
+        self.assertEqual(IterableStatistics.iterable_mean_median([7, 1, 5, 3]), (4.0, 4.0))  # Even count, unsorted input
+        self.assertEqual(IterableStatistics.iterable_mean_median([2**60 + 1, 2**60, 2**60 + 3])[1], 2**60 + 1)  # Ints above 2**53 stay exact
+        self.assertEqual(IterableStatistics.iterable_mean_median([5, None, 1, 3]), (3.0, 3))  # None is ignored
+
+    # Test for iterable_running_median method
+    def test_iterable_running_median_valid_input(self):
+        medians = list(IterableStatistics.iterable_running_median(x for x in [5, 1, None, 3, 10]))
+        self.assertEqual(medians, [5, 3.0, 3, 4.0])  # Median after each valid value
     
     # Test for iterable_min_max method
     def test_iterable_min_max_valid_input(self):
@@ -54,6 +65,51 @@ class TestIterableStatistics(unittest.TestCase):
     def test_iterable_first_last_valid_input(self):
         self.assertEqual(IterableStatistics.iterable_first_last([1, 2, 3]), (1, 3))  # First and last element
 
+    # Test for iterable_summary method
+    def test_iterable_summary_generator_input(self):
+        summary = IterableStatistics.iterable_summary(x for x in [1, 2, None, 3, 4, 5])  # Generator is read once
+        self.assertEqual(summary['count'], 5)
+        self.assertEqual((summary['first'], summary['last']), (1, 5))
+        self.assertEqual((summary['min'], summary['max']), (1, 5))
+        self.assertEqual((summary['sum'], summary['product']), (15, 120))
+        self.assertEqual(summary['mean'], 3.0)
+        self.assertAlmostEqual(summary['var'], 2.0)
+
+    # Test for OnlineAccumulator.merge method
+    def test_online_accumulator_merge(self):
+        data = [3.5, 1.0, 7.25, 2.0, 9.0, 4.5, 6.0]
+        merged = OnlineAccumulator(data[:3]).merge(OnlineAccumulator(data[3:]))
+        whole = OnlineAccumulator(data)
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual((merged.first, merged.last), (3.5, 6.0))
+        self.assertEqual((merged.min, merged.max), (1.0, 9.0))
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.std_var()[1], IterableStatistics.iterable_std_var(data)[1])
+
+    # Test the NumPy fast path for array and buffer inputs
+    def test_numeric_buffer_inputs_match_lists(self):
+        data = [4.0, 1.5, float('nan'), 3.25, 8.0, 2.0]
+        valid = [x for x in data if x == x]
+        for values in (np.array(data), array.array('d', data), pd.Series(data)):
+            self.assertEqual(IterableStatistics.iterable_count(values), 5)
+            self.assertEqual(IterableStatistics.iterable_sum(values), IterableStatistics.iterable_sum(valid))
+            self.assertEqual(IterableStatistics.iterable_min_max(values), (1.5, 8.0))
+            self.assertEqual(IterableStatistics.iterable_mean_median(values), IterableStatistics.iterable_mean_median(valid))
+            self.assertAlmostEqual(IterableStatistics.iterable_std_var(values)[1], IterableStatistics.iterable_std_var(valid)[1])
+            self.assertAlmostEqual(IterableStatistics.iterable_mad(values), IterableStatistics.iterable_mad(valid))
+            self.assertEqual(IterableStatistics.iterable_prod(values), IterableStatistics.iterable_prod(valid))
+            self.assertEqual(IterableStatistics.iterable_first_last(values), (4.0, 2.0))
+
+    def test_numeric_buffer_integer_product(self):
+        values = np.array([10 ** 6] * 4, dtype=np.int64)
+        self.assertEqual(IterableStatistics.iterable_prod(values), 10 ** 24)  # No int64 overflow
+
+    def test_numeric_buffer_integer_sum(self):
+        values = np.array([2 ** 62, 2 ** 62], dtype=np.int64)
+        self.assertEqual(IterableStatistics.iterable_sum(values), IterableStatistics.iterable_sum([2 ** 62, 2 ** 62]))
+        self.assertEqual(IterableStatistics.iterable_summary(values)['sum'], 2 ** 63)  # No int64 overflow
+        self.assertEqual(IterableStatistics.iterable_sum(np.array([2 ** 63] * 2, dtype=np.uint64)), 2 ** 64)
+
     # ==========================
     # Invalid input tests
     # ==========================
@@ -133,6 +189,22 @@ class TestIterableStatistics(unittest.TestCase):
         with self.assertRaises(ValueError):
             IterableStatistics.iterable_first_last([])  # Empty iterable should raise an error
 
+    # Test for iterable_summary method
+    def test_iterable_summary_invalid_input(self):
+        with self.assertRaises(TypeError):
+            IterableStatistics.iterable_summary(123)  # Invalid input, should be an iterable
+        with self.assertRaises(TypeError):
+            IterableStatistics.iterable_summary([1, 2, 'a'])  # Non-numeric value should raise an error
+        with self.assertRaises(ValueError):
+            IterableStatistics.iterable_summary([])  # Empty iterable should raise an error
+
+    # Test the NumPy fast path for array and buffer inputs
+    def test_numeric_buffer_invalid_input(self):
+        with self.assertRaises(ValueError):
+            IterableStatistics.iterable_sum(np.array([np.nan, np.nan]))  # Only NaN values should raise an error
+        with self.assertRaises(ValueError):
+            IterableStatistics.iterable_mean_median(array.array('d'))  # Empty buffer should raise an error
+
 def main():
     unittest.main(argv=['first-arg-is-ignored'], exit=False, verbosity=3)
 
@@ -9,6 +9,7 @@ import unittest
 import pandas as pd
 import numpy as np
 from biztools.iterator_date_utils import IteratorDateUtils  # Import the IteratorDateUtils class
+from biztools.business_calendar import BusinessCalendar
 
 class TestIteratorDateUtils(unittest.TestCase):
     
@@ -45,6 +46,45 @@ class TestIteratorDateUtils(unittest.TestCase):
         # The first row should have NaN since there is no previous row to calculate
         self.assertTrue(pd.isna(result['business_days_to_previous'].iloc[0]))
 
+    def test_business_days_match_bdate_range(self):
+        # Test the vectorized counts against bdate_range, with times of day, reversed ranges and weekends
+        starts = pd.Series(pd.to_datetime(['2024-12-06 18:30', '2024-12-07 00:00', '2024-12-10 00:00', '2024-12-14 00:00', '2024-12-02 00:00']))
+        ends = pd.Series(pd.to_datetime(['2024-12-09 08:00', '2024-12-08 00:00', '2024-12-03 00:00', '2024-12-14 00:00', '2025-01-31 00:00']))
+        result = IteratorDateUtils.iter_business_days(pd.DataFrame({'start': starts, 'end': ends}), 'start', 'end')
+        expected = [len(pd.bdate_range(start=start, end=end)) - 1 for start, end in zip(starts, ends)]
+        self.assertEqual(result['business_days_between'].tolist(), expected)
+        self.assertEqual(expected[:4], [1, -1, -1, -1])
+
+    def test_business_days_with_missing_dates(self):
+        # Rows with a missing date get NaN instead of a count
+        self.df.loc[3, 'delivery_end_date'] = pd.NaT
+        self.df.loc[5, 'delivery_start_date'] = pd.NaT
+        between = IteratorDateUtils.iter_business_days(self.df.copy(), 'delivery_start_date', 'delivery_end_date')
+        to_previous = IteratorDateUtils.business_days_between_rows(self.df.copy(), 'delivery_start_date')
+        self.assertTrue(between['business_days_between'].iloc[[3, 5]].isna().all())
+        self.assertEqual(between['business_days_between'].notna().sum(), len(self.df) - 2)
+        self.assertTrue(to_previous['business_days_to_previous'].iloc[[0, 5, 6]].isna().all())
+        self.assertEqual(to_previous['business_days_to_previous'].iloc[8], 0)  # 2024-12-08 (Sun) -> 2024-12-09 (Mon)
+        self.assertEqual(to_previous['business_days_to_previous'].iloc[10], 1)  # 2024-12-10 (Tue) -> 2024-12-11 (Wed)
+
+    def test_holiday_calendar(self):
+        # Date methods skip the calendar's holidays as well as weekends
+        holidays = ['2024-12-25', '2024-12-26', '2025-01-01']
+        calendar = BusinessCalendar(holidays)
+        df = pd.DataFrame({'date': pd.to_datetime(['2024-12-24', '2024-12-27', '2024-12-31'])})
+        result = IteratorDateUtils.iter_next_working_day(df.copy(), 'date', calendar=calendar)
+        self.assertEqual(result['next_working_day'].tolist(), list(pd.to_datetime(['2024-12-27', '2024-12-30', '2025-01-02'])))
+        result = IteratorDateUtils.subtract_business_days(df.copy(), 'date', 1, calendar=calendar)
+        self.assertEqual(result['date_minus_business_days'].tolist(), list(pd.to_datetime(['2024-12-23', '2024-12-24', '2024-12-30'])))
+        result = IteratorDateUtils.is_business_day(pd.DataFrame({'date': pd.to_datetime(['2024-12-25', '2024-12-27'])}),
+                                                   'date', calendar=calendar)
+        self.assertEqual(result['is_business_day'].tolist(), [False, True])
+        result = IteratorDateUtils.business_days_between_rows(df.copy(), 'date', calendar=calendar)
+        self.assertEqual(result['business_days_to_previous'].tolist()[1:], [1, 2])
+        result = IteratorDateUtils.add_business_days(self.df.copy(), 'delivery_start_date', 5, calendar=calendar)
+        expected = [date + pd.tseries.offsets.CustomBusinessDay(5, holidays=holidays) for date in self.df['delivery_start_date']]
+        self.assertEqual(result['date_plus_business_days'].tolist(), expected)
+
     def test_iter_next_working_day_true(self):
         # Test the case where next working day is calculated correctly
         result = IteratorDateUtils.iter_next_working_day(self.df, 'delivery_start_date', 'next_working_day')
@@ -120,6 +160,49 @@ class TestIteratorDateUtils(unittest.TestCase):
             expected_weekday = date.day_name()  # Get the expected weekday name from the date
             self.assertEqual(weekday_name, expected_weekday, f"Failed for row {i}: Expected {expected_weekday} but got {weekday_name}")
 
+    def test_weekday_name_categorical(self):
+        # The categorical column has the same names, with the seven weekdays as ordered categories
+        self.df.loc[0, 'delivery_start_date'] = np.nan
+        expected = IteratorDateUtils.weekday_name(self.df.copy(), 'delivery_start_date')['weekday_name']
+        result = IteratorDateUtils.weekday_name(self.df, 'delivery_start_date', categorical=True)['weekday_name']
+        self.assertIsInstance(result.dtype, pd.CategoricalDtype)
+        self.assertEqual(list(result.cat.categories), ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+                                                       'Saturday', 'Sunday'])
+        self.assertTrue(pd.isna(result.iloc[0]))
+        self.assertEqual(result.iloc[1:].astype(str).tolist(), expected.iloc[1:].tolist())
+
+    def test_iter_enrich_matches_whole_frame(self):
+        # Chunks give the same columns as the whole frame, with the previous date carried across chunks
+        calendar = BusinessCalendar(['2024-12-25', '2025-01-01'])
+        self.df.loc[40, 'delivery_start_date'] = np.nan
+        enrichments = [
+            {'enrichment': 'business_days_between_rows', 'date_column': 'delivery_start_date', 'calendar': calendar},
+            {'enrichment': 'business_days', 'start_date_col': 'delivery_start_date', 'end_date_col': 'delivery_end_date'},
+            {'enrichment': 'next_working_day', 'date_column': 'delivery_start_date'},
+            {'enrichment': 'days_difference', 'start_date_col': 'delivery_start_date', 'end_date_col': 'delivery_end_date'},
+            {'enrichment': 'weekday_name', 'date_col': 'delivery_start_date'}
+        ]
+        chunks = [self.df.iloc[i:i + 30].copy() for i in range(0, len(self.df), 30)]
+        chunks.insert(2, self.df.iloc[:0].copy())
+        result = pd.concat(IteratorDateUtils.iter_enrich(iter(chunks), enrichments))
+
+        expected = IteratorDateUtils.business_days_between_rows(self.df.copy(), 'delivery_start_date', calendar=calendar)
+        expected = IteratorDateUtils.iter_business_days(expected, 'delivery_start_date', 'delivery_end_date')
+        expected = IteratorDateUtils.iter_next_working_day(expected, 'delivery_start_date')
+        expected = IteratorDateUtils.days_difference(expected, 'delivery_start_date', 'delivery_end_date')
+        expected = IteratorDateUtils.weekday_name(expected, 'delivery_start_date')
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_iter_enrich_invalid_enrichment(self):
+        with self.assertRaises(ValueError):
+            list(IteratorDateUtils.iter_enrich([self.df], [{'enrichment': 'fiscal_year'}]))
+
+    def test_is_business_day_missing_dates(self):
+        self.df.loc[0, 'delivery_start_date'] = np.nan
+        result = IteratorDateUtils.is_business_day(self.df, 'delivery_start_date')
+        self.assertEqual(result['is_business_day'].dtype, bool)
+        self.assertFalse(result['is_business_day'].iloc[0])
+
     def test_days_difference(self):
         # Test the case where the days difference is calculated correctly
         result = IteratorDateUtils.days_difference(self.df, 'delivery_start_date', 'delivery_end_date', 'days_difference')
@@ -131,6 +214,32 @@ class TestIteratorDateUtils(unittest.TestCase):
             expected_difference = (end_date - start_date).days  # Calculate expected difference
             self.assertEqual(result['days_difference'].iloc[i], expected_difference, 
                              f"Failed for row {i}: Expected {expected_difference} but got {result['days_difference'].iloc[i]}")
+
+    def test_string_dates_match_parsed_dates(self):
+        # String columns in the sales data format give the same results as datetime64 columns
+        strings = self.df.copy()
+        strings['delivery_start_date'] = strings['delivery_start_date'].dt.strftime('%m/%d/%Y %H:%M')
+        strings['delivery_end_date'] = strings['delivery_end_date'].dt.strftime('%m/%d/%Y %H:%M')
+        expected = IteratorDateUtils.iter_business_days(self.df.copy(), 'delivery_start_date', 'delivery_end_date')
+        result = IteratorDateUtils.iter_business_days(strings, 'delivery_start_date', 'delivery_end_date')
+        self.assertEqual(result['business_days_between'].tolist(), expected['business_days_between'].tolist())
+
+    def test_calls_do_not_share_formats(self):
+        # Each call infers the format of its own frame, like pd.to_datetime
+        IteratorDateUtils.weekday_name(pd.DataFrame({'d': ['13/01/2024', '14/01/2024']}), 'd')
+        result = IteratorDateUtils.days_difference(pd.DataFrame({'start': ['01/02/2024'], 'd': ['03/04/2024']}),
+                                                   'start', 'd')
+        expected = (pd.Timestamp('2024-03-04') - pd.Timestamp('2024-01-02')).days
+        self.assertEqual(result['days_difference'].tolist(), [expected])
+
+    def test_iter_enrich_keeps_stream_format(self):
+        # The format inferred on the first chunk is kept for the stream and replaced when a chunk does not match it
+        chunks = [pd.DataFrame({'d': ['13/01/2024']}), pd.DataFrame({'d': ['01/02/2024']}),
+                  pd.DataFrame({'d': ['2024-12-25']})]
+        result = pd.concat(IteratorDateUtils.iter_enrich(chunks, [{'enrichment': 'weekday_name', 'date_col': 'd'}]))
+        self.assertEqual(result['weekday_name'].tolist(), ['Saturday', 'Thursday', 'Wednesday'])
+        self.assertEqual(result['d'].tolist(), ['13/01/2024', '01/02/2024', '2024-12-25'])
+
     # ==========================
     # Invalid input tests
     # ==========================
@@ -195,6 +304,10 @@ class TestIteratorDateUtils(unittest.TestCase):
         # The first row should have NaN in the 'weekday_name' column
         self.assertTrue(pd.isna(result['weekday_name'].iloc[0]), "Expected NaN for row 0, but got a value")
 
+    def test_invalid_calendar(self):
+        with self.assertRaises(ValueError):
+            IteratorDateUtils.add_business_days(self.df, 'delivery_start_date', 2, calendar=['2024-12-25'])
+
 def main():
     unittest.main(argv=['first-arg-is-ignored'], exit=False, verbosity=3)
 
@@ -5,9 +5,11 @@ main_directory_path = os.path.abspath(os.path.join(current_directory, '..'))
 sys.path.insert(0, main_directory_path)
 
 import unittest
+import math
 import numpy as np
+import pandas as pd
 import random
-from biztools.lazy_rolling_window import LazyRollingWindow
+from biztools.lazy_rolling_window import LazyRollingWindow, StreamingRollingWindow, KeyedRollingWindow, TimeRollingWindow
 
 # Assuming LazyRollingWindow is already imported or defined in the same file.
 
@@ -70,6 +72,202 @@ class TestLazyRollingWindow(unittest.TestCase):
         result = self.window.detect_seasonality()
         self.assertIsNotNone(result)
 
+    def test_incremental_statistics_across_windows(self):
+        """Test that the incrementally updated statistics match a recomputation at every step."""
+        data = [random.uniform(-100, 100) for _ in range(200)]
+        window = LazyRollingWindow(data, 7)
+        for start in range(len(data) - 7 + 1):
+            window_data = data[start:start + 7]
+            self.assertAlmostEqual(window.get_window_sum(), sum(window_data), places=6)
+            self.assertAlmostEqual(window.get_window_avg(), sum(window_data) / 7, places=6)
+            self.assertAlmostEqual(window.get_window_std_dev(), np.std(window_data), places=6)
+            self.assertEqual(window.get_max_of_window(), max(window_data))
+            self.assertEqual(window.get_min_of_window(), min(window_data))
+            window.next_window()
+
+    def test_compute_all_windows(self):
+        """Test that compute_all_windows matches the step-by-step getters at every position."""
+        data = self.data_valid + [1000, -500] + self.data_valid[:10]
+        window = LazyRollingWindow(data, self.window_size)
+        result = window.compute_all_windows()
+        self.assertEqual(len(result['sum']), len(data) - self.window_size + 1)
+        for i in range(len(result['sum'])):
+            self.assertAlmostEqual(result['sum'][i], window.get_window_sum())
+            self.assertAlmostEqual(result['avg'][i], window.get_window_avg())
+            self.assertAlmostEqual(result['std_dev'][i], window.get_window_std_dev())
+            self.assertEqual(result['max'][i], window.get_max_of_window())
+            self.assertEqual(result['min'][i], window.get_min_of_window())
+            self.assertAlmostEqual(result['seasonality'][i], window.detect_seasonality())
+            window_data = np.array(window._get_window_data())
+            outside = (window_data < result['lower_bound'][i]) | (window_data > result['upper_bound'][i])
+            self.assertEqual(list(window_data[outside]), window.detect_outliers())
+            self.assertEqual(result['outlier_count'][i], len(window.detect_outliers()))
+            window.next_window()
+        # A budget of one window per block gives the same arrays
+        for key, values in window.compute_all_windows(block_bytes=1).items():
+            np.testing.assert_array_equal(values, result[key])
+
+    def test_compute_all_windows_short_window(self):
+        """Test that statistics undefined for short windows are reported as in the getters."""
+        result = LazyRollingWindow([1, 2, 3, 4], 2).compute_all_windows()
+        self.assertTrue(np.isnan(result['seasonality']).all())  # detect_seasonality returns None
+        self.assertFalse(result['outlier_count'].any())  # detect_outliers returns []
+        self.assertTrue(np.isnan(result['lower_bound']).all())
+
+    def test_streaming_compute_all_windows(self):
+        """Test that a stream, which only keeps its current window, refuses compute_all_windows."""
+        with self.assertRaises(TypeError):
+            StreamingRollingWindow(iter(range(10)), 3).compute_all_windows()
+
+    def test_non_finite_values(self):
+        """Test that NaN and inf give the same statistics as the window slice, and do not linger after leaving it."""
+        window = LazyRollingWindow([1, float('inf'), 2, 3, 4, 5, 6, 7, 8, 9], 3)
+        self.assertEqual(window.get_window_sum(), float('inf'))
+        window.next_window()
+        window.next_window()  # [2, 3, 4]
+        self.assertEqual(window.get_window_sum(), 9.0)
+        self.assertAlmostEqual(window.get_window_std_dev(), np.std([2, 3, 4]))
+        self.assertEqual(window.get_max_of_window(), 4.0)
+        window = LazyRollingWindow([1, float('nan'), 2, 5, 4], 3)
+        self.assertTrue(math.isnan(window.get_window_sum()))
+        self.assertEqual(window.get_max_of_window(), max([1.0, float('nan'), 2.0]))
+        window.next_window()
+        window.next_window()
+        self.assertEqual(window.get_max_of_window(), 5.0)
+        time_window = TimeRollingWindow('2D')
+        time_window.update([('2003-01-01', 1), ('2003-01-02', float('nan')), ('2003-01-03', 3), ('2003-01-04', 4)])
+        self.assertEqual(time_window.get_window_sum(), 7.0)
+        self.assertEqual(time_window.get_min_of_window(), 3.0)
+
+    def test_rolling_outliers_match_percentile(self):
+        """Test that the rolling IQR outliers match np.percentile on each window slice."""
+        data = [random.uniform(0, 100) for _ in range(150)] + [900, -700] + [random.uniform(0, 100) for _ in range(50)]
+        window = LazyRollingWindow(data, 10)
+        results = list(window.iter_outliers())
+        self.assertEqual(len(results), len(data) - 10 + 1)
+        for start, result in enumerate(results):
+            window_data = data[start:start + 10]
+            q1, q3 = np.percentile(window_data, [25, 75])
+            iqr = q3 - q1
+            expected = [x for x in window_data if x < q1 - 1.5 * iqr or x > q3 + 1.5 * iqr]
+            self.assertEqual(result, expected)
+        self.assertIn([900.0, -700.0], results)
+
+    def test_rolling_outliers_with_nan(self):
+        """Test that NaN and inf in the data give the np.percentile results instead of breaking the sorted window."""
+        data = [random.uniform(0, 100) for _ in range(30)]
+        data[5] = float('nan')
+        data[20] = float('inf')
+        for window in (LazyRollingWindow(data, 6), StreamingRollingWindow(iter(data), 6)):
+            results = list(window.iter_outliers())
+            self.assertEqual(len(results), len(data) - 6 + 1)
+            for start, result in enumerate(results):
+                window_data = data[start:start + 6]
+                q1, q3 = np.percentile(window_data, [25, 75])
+                iqr = q3 - q1
+                expected = [x for x in window_data if x < q1 - 1.5 * iqr or x > q3 + 1.5 * iqr]
+                self.assertEqual(result, expected)
+        self.assertEqual(results[0], [])  # NaN in the window: no outliers, as np.percentile gives NaN fences
+
+    def test_streaming_window_outliers(self):
+        """Test that a generator-fed window streams the same outliers as the list-based window."""
+        data = [1, 2, 3, 2, 1, 50, 2, 3, 1, 2, -40, 3]
+        stream = StreamingRollingWindow(iter(data), 5)
+        expected = list(LazyRollingWindow(data, 5).iter_outliers())
+        self.assertEqual(list(stream.iter_outliers()), expected)
+        self.assertEqual(expected[1], [50.0])
+
+    def test_streaming_window_from_generator(self):
+        """Test that a generator-fed window yields the same statistics as the list-based window."""
+        stream = StreamingRollingWindow((x for x in self.data_valid), self.window_size)
+        window = LazyRollingWindow(self.data_valid, self.window_size)
+        results = list(stream.iter_windows())
+        self.assertEqual(len(results), len(self.data_valid) - self.window_size + 1)
+        for result in results:
+            self.assertAlmostEqual(result['sum'], window.get_window_sum())
+            self.assertAlmostEqual(result['std_dev'], window.get_window_std_dev())
+            self.assertEqual(result['max'], window.get_max_of_window())
+            self.assertEqual(result['min'], window.get_min_of_window())
+            window.next_window()
+
+    def test_streaming_window_keeps_only_window(self):
+        """Test that the streaming window only holds window_size values."""
+        stream = StreamingRollingWindow(iter(range(1000)), 4)
+        for _ in range(500):
+            stream.next_window()
+        self.assertEqual(len(stream._buffer), 4)
+        self.assertEqual(list(stream._get_window_data()), [500.0, 501.0, 502.0, 503.0])
+
+    def test_keyed_window_matches_per_key_windows(self):
+        """Test that every key of a keyed window matches a LazyRollingWindow over that key's series."""
+        events = [(random.choice(['A', 'B', 'C']), random.uniform(-100, 100)) for _ in range(300)]
+        keyed = KeyedRollingWindow(self.window_size, capacity=2)
+        keyed.update(events)
+        self.assertEqual(sorted(keyed.keys()), ['A', 'B', 'C'])
+        result = keyed.compute_all_keys()
+        for i, key in enumerate(result['keys']):
+            series = [value for event_key, value in events if event_key == key]
+            window = LazyRollingWindow(series[-self.window_size:], self.window_size)
+            self.assertEqual(keyed.get_window_data(key), series[-self.window_size:])
+            self.assertAlmostEqual(keyed.get_window_sum(key), window.get_window_sum())
+            self.assertAlmostEqual(keyed.get_window_avg(key), window.get_window_avg())
+            self.assertAlmostEqual(keyed.get_window_std_dev(key), window.get_window_std_dev())
+            self.assertEqual(keyed.get_max_of_window(key), window.get_max_of_window())
+            self.assertEqual(keyed.get_min_of_window(key), window.get_min_of_window())
+            self.assertAlmostEqual(result['sum'][i], window.get_window_sum())
+            self.assertAlmostEqual(result['std_dev'][i], window.get_window_std_dev())
+            self.assertEqual(result['max'][i], window.get_max_of_window())
+            self.assertEqual(result['min'][i], window.get_min_of_window())
+
+    def test_keyed_window_partial_windows(self):
+        """Test keys with fewer values than the window size."""
+        keyed = KeyedRollingWindow(4)
+        keyed.update([('x', 1), ('y', 10), ('x', 3)])
+        result = keyed.compute_all_keys()
+        self.assertEqual(result['keys'], ['x', 'y'])
+        self.assertEqual(list(result['count']), [2, 1])
+        self.assertEqual(list(result['avg']), [2.0, 10.0])
+        self.assertEqual(list(result['std_dev']), [1.0, 0.0])
+        self.assertEqual(list(result['min']), [1.0, 10.0])
+        self.assertEqual(keyed.get_window_data('x'), [1.0, 3.0])
+
+    def test_time_window_matches_pandas_rolling(self):
+        """Test that a 30-day event-time window matches pandas rolling('30D') on irregular timestamps."""
+        timestamps = sorted(pd.Timestamp('2003-01-01') + pd.Timedelta(hours=random.randint(0, 24 * 365))
+                            for _ in range(200))
+        values = [random.uniform(0, 100) for _ in timestamps]
+        expected = pd.Series(values, index=pd.DatetimeIndex(timestamps)).rolling('30D')
+        results = list(TimeRollingWindow('30D').iter_windows(zip(timestamps, values)))
+        self.assertEqual(len(results), len(values))
+        for result, total, count, maximum in zip(results, expected.sum(), expected.count(), expected.max()):
+            self.assertAlmostEqual(result['sum'], total)
+            self.assertEqual(result['count'], count)
+            self.assertEqual(result['max'], maximum)
+
+    def test_time_window_out_of_order_events(self):
+        """Test that events late by less than the allowed lateness are reordered and later ones dropped."""
+        window = TimeRollingWindow('2D', allowed_lateness='1D')
+        window.update([('2003-01-01', 1), ('2003-01-03', 3), ('2003-01-02', 2)])
+        self.assertEqual(window.window_end, pd.Timestamp('2003-01-02'))
+        self.assertEqual(window._get_window_data(), [1.0, 2.0])
+        window.push('2003-01-05', 5)
+        self.assertEqual(window._get_window_data(), [2.0, 3.0])  # Jan 3 released, window (Jan 1, Jan 3]
+        window.push('2003-01-01 12:00', 100)
+        self.assertEqual(window.late_events, 1)
+        window.flush()
+        self.assertEqual(window.window_end, pd.Timestamp('2003-01-05'))
+        self.assertEqual(window._get_window_data(), [5.0])
+        self.assertEqual(window.get_window_sum(), 5.0)
+
+    def test_time_window_business_days(self):
+        """Test a window over the last business days, skipping the weekend."""
+        window = TimeRollingWindow(business_days=2)
+        window.update([('2003-01-02', 1), ('2003-01-03', 2), ('2003-01-04', 4), ('2003-01-06 10:00', 6)])
+        # Friday Jan 3 and Monday Jan 6 are the last two business days; Saturday Jan 4 falls in between
+        self.assertEqual(window._get_window_data(), [2.0, 4.0, 6.0])
+        self.assertEqual(window.get_min_of_window(), 2.0)
+        self.assertAlmostEqual(window.get_window_avg(), 4.0)
+
     # ==========================
     # Invalid input tests
     # ==========================
@@ -98,6 +296,43 @@ class TestLazyRollingWindow(unittest.TestCase):
         with self.assertRaises(ValueError):
             LazyRollingWindow([1, 2, 3, 4], "three")  # Invalid window size type
 
+    def test_streaming_window_invalid_input(self):
+        """Test invalid input for the streaming window."""
+        with self.assertRaises(TypeError):
+            StreamingRollingWindow(123, 5)
+        with self.assertRaises(ValueError):
+            StreamingRollingWindow(iter([]), 5)
+        with self.assertRaises(ValueError):
+            StreamingRollingWindow(iter([1, 2, "a", 4]), 3)
+
+    def test_keyed_window_invalid_input(self):
+        """Test invalid window size, non-numeric values and unknown keys in the keyed window."""
+        with self.assertRaises(ValueError):
+            KeyedRollingWindow(0)
+        keyed = KeyedRollingWindow(3)
+        with self.assertRaises(ValueError):
+            keyed.push('A', 'abc')
+        with self.assertRaises(TypeError):
+            keyed.update(123)
+        with self.assertRaises(KeyError):
+            keyed.get_window_sum('missing')
+
+    def test_time_window_invalid_input(self):
+        """Test invalid window specifications, timestamps and values in the event-time window."""
+        with self.assertRaises(ValueError):
+            TimeRollingWindow()
+        with self.assertRaises(ValueError):
+            TimeRollingWindow('30D', business_days=5)
+        with self.assertRaises(ValueError):
+            TimeRollingWindow('-1D')
+        with self.assertRaises(ValueError):
+            TimeRollingWindow(business_days=0)
+        window = TimeRollingWindow('1D')
+        with self.assertRaises(ValueError):
+            window.push('not a date', 1)
+        with self.assertRaises(ValueError):
+            window.push('2003-01-01', 'abc')
+
     def test_next_window(self):
         """Test moving to the next window."""
         self.window.next_window()  # Move the window
@@ -54,6 +54,12 @@ class TestStreamAggregations(unittest.TestCase):
         result = StreamAggregations.stream_group_mad(self.df, ['store'], 'sales')
         self.assertEqual(result.shape[0], 3)  # Should return 3 groups (for 3 stores)
     
+    def test_stream_group_mad_matches_definition(self):
+        result = StreamAggregations.stream_group_mad(self.df, ['store'], 'sales')
+        for _, row in result.iterrows():
+            values = self.df.loc[self.df['store'] == row['store'], 'sales'].dropna()
+            self.assertAlmostEqual(row['mad'], (values - values.mean()).abs().mean(), places=2)
+
     def test_stream_group_prod(self):
         result = StreamAggregations.stream_group_prod(self.df, ['store'], 'sales')
         self.assertEqual(result.shape[0], 3)  # Should return 3 groups (for 3 stores)
@@ -62,6 +68,73 @@ class TestStreamAggregations(unittest.TestCase):
         result = StreamAggregations.stream_group_sum(self.df, ['store'], 'sales')
         self.assertEqual(result.shape[0], 3)  # Should return 3 groups (for 3 stores)
     
+    def test_stream_group_agg(self):
+        metrics = ['count', 'sum', 'min', 'max', 'std', 'var', 'mean', 'median']
+        result = StreamAggregations.stream_group_agg(self.df, ['store'], 'sales', metrics)
+        self.assertEqual(list(result.columns), ['store'] + metrics)
+        expected = StreamAggregations.stream_group_std_var(self.df, ['store'], 'sales')
+        pd.testing.assert_frame_equal(result[['store', 'std', 'var']], expected)
+        expected = StreamAggregations.stream_group_mean_median(self.df, ['store'], 'sales')
+        pd.testing.assert_frame_equal(result[['store', 'mean', 'median']], expected)
+
+    def test_stream_group_agg_chunks_matches_in_memory(self):
+        chunks = [self.df.iloc[i:i + 17].copy() for i in range(0, len(self.df), 17)]
+        result = StreamAggregations.stream_group_agg_chunks(chunks, ['store'], 'sales', ['count', 'min', 'max', 'std', 'var', 'sum'])
+        expected = {
+            'count': StreamAggregations.stream_group_count(self.df.copy(), ['store'], 'sales'),
+            'min_max': StreamAggregations.stream_group_min_max(self.df.copy(), ['store'], 'sales'),
+            'std_var': StreamAggregations.stream_group_std_var(self.df.copy(), ['store'], 'sales'),
+            'sum': StreamAggregations.stream_group_sum(self.df.copy(), ['store'], 'sales')
+        }
+        for expected_df in expected.values():
+            columns = list(expected_df.columns)
+            pd.testing.assert_frame_equal(result[columns], expected_df, check_dtype=False)
+
+    def test_stream_group_agg_chunks_first_last_across_chunks(self):
+        chunks = [self.df.iloc[i:i + 10].copy() for i in range(0, len(self.df), 10)]
+        result = StreamAggregations.stream_group_agg_chunks(iter(chunks), ['store'], 'sales', ['first', 'last'])
+        expected = StreamAggregations.stream_group_first_last(self.df.copy(), ['store'], 'sales')
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_stream_group_agg_chunks_exact_median(self):
+        chunks = [self.df.iloc[i:i + 15].copy() for i in range(0, len(self.df), 15)]
+        result = StreamAggregations.stream_group_agg_chunks(chunks, ['store'], 'sales', ['mean', 'median'], median_mode='exact')
+        expected = StreamAggregations.stream_group_mean_median(self.df, ['store'], 'sales')
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_stream_group_agg_chunks_approx_median(self):
+        values = np.random.uniform(0, 1000, size=100000)
+        chunks = [pd.DataFrame({'store': 'Store A', 'sales': values[i:i + 10000]}) for i in range(0, len(values), 10000)]
+        result = StreamAggregations.stream_group_agg_chunks(chunks, ['store'], 'sales', ['median'], median_error=0.01)
+        rank = (values < result['median'].iloc[0]).mean()
+        self.assertLess(abs(rank - 0.5), 0.02)
+
+    def test_stream_group_agg_parallel(self):
+        metrics = ['count', 'first', 'mean', 'median', 'std', 'mad', 'sum']
+        expected = StreamAggregations.stream_group_agg(self.df, ['store', 'region'], 'sales', metrics)
+        for executor in ('process', 'thread'):
+            result = StreamAggregations.stream_group_agg(self.df, ['store', 'region'], 'sales', metrics, n_jobs=3, executor=executor)
+            pd.testing.assert_frame_equal(result, expected)
+
+    def test_group_keys_not_mutated(self):
+        self.df['store_id'] = self.df['store'].str[-1].map({'A': 1, 'B': 2, 'C': 3})
+        StreamAggregations.stream_group_sum(self.df, ['store_id'], 'sales')
+        self.assertTrue(pd.api.types.is_integer_dtype(self.df['store_id']))
+
+    def test_native_keys(self):
+        self.df['store_id'] = self.df['store'].str[-1].map({'A': 1, 'B': 2, 'C': 3})
+        expected = StreamAggregations.stream_group_sum(self.df, ['store_id'], 'sales')
+        result = StreamAggregations.stream_group_sum(self.df, ['store_id'], 'sales', native_keys=True)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        self.assertTrue(pd.api.types.is_integer_dtype(self.df['store_id']))
+
+    def test_native_keys_categorical(self):
+        self.df['store'] = self.df['store'].astype('category')
+        result = StreamAggregations.stream_group_agg(self.df, ['store', 'region'], 'sales', ['count', 'mad'], native_keys=True)
+        expected = StreamAggregations.stream_group_agg(self.df, ['store', 'region'], 'sales', ['count', 'mad'])
+        expected['store'] = expected['store'].astype(str)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
     # ==========================
     # Invalid input tests
     # ==========================
@@ -85,6 +158,29 @@ class TestStreamAggregations(unittest.TestCase):
 
         self.assertEqual(str(context.exception), "The value column 'store' must contain numeric data.")
 
+    def test_stream_group_agg_invalid_metric(self):
+        with self.assertRaises(ValueError):
+            StreamAggregations.stream_group_agg(self.df, ['store'], 'sales', ['mode'])
+
+    def test_stream_group_agg_invalid_n_jobs(self):
+        with self.assertRaises(ValueError):
+            StreamAggregations.stream_group_agg(self.df, ['store'], 'sales', ['sum'], n_jobs=0)
+        with self.assertRaises(ValueError):
+            StreamAggregations.stream_group_agg(self.df, ['store'], 'sales', ['sum'], n_jobs=2, executor='gpu')
+
+    def test_stream_group_agg_chunks_invalid_metric(self):
+        with self.assertRaises(ValueError):
+            StreamAggregations.stream_group_agg_chunks([self.df], ['store'], 'sales', ['mode'])
+
+    def test_stream_group_agg_chunks_invalid_median_mode(self):
+        with self.assertRaises(ValueError):
+            StreamAggregations.stream_group_agg_chunks([self.df], ['store'], 'sales', ['median'], median_mode='fast')
+
+    def test_stream_group_agg_chunks_no_chunks(self):
+        result = StreamAggregations.stream_group_agg_chunks([], ['store'], 'sales', ['sum'])
+        self.assertEqual(list(result.columns), ['store', 'sum'])
+        self.assertEqual(result.shape[0], 0)
+
     def test_empty_dataframe(self):
         # Test with an empty dataframe
         empty_df = pd.DataFrame(columns=['store', 'region', 'sales', 'date'])
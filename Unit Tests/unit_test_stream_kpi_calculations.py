@@ -6,8 +6,10 @@ sys.path.insert(0, main_directory_path)
 
 
 import unittest
+import tempfile
+import numpy as np
 import pandas as pd
-from biztools.stream_kpi_calculations import StreamKpiCalculations  # Replace with the correct import for your module
+from biztools.stream_kpi_calculations import StreamKpiCalculations, IncrementalKpiCalculator  # Replace with the correct import for your module
 
 class TestStreamKpiCalculations(unittest.TestCase):
 
@@ -47,6 +49,158 @@ class TestStreamKpiCalculations(unittest.TestCase):
         for value in result['growth_rate']:
             self.assertEqual(round(value, 2), value)
 
+    def test_output_series_and_array(self):
+        """Test that the series and array outputs return the KPI without modifying the input."""
+        expected = StreamKpiCalculations.stream_churn_rate(self.df.copy(), 'start_customers', 'end_customers')
+        series = StreamKpiCalculations.stream_churn_rate(self.df, 'start_customers', 'end_customers',
+                                                         output='series')
+        array = StreamKpiCalculations.stream_revenue_growth(self.df, 'revenue', output='array')
+        self.assertNotIn('churn_rate', self.df.columns)
+        self.assertNotIn('revenue_growth', self.df.columns)
+        pd.testing.assert_series_equal(series, expected['churn_rate'])
+        self.assertIsInstance(array, np.ndarray)
+        self.assertEqual(array[1], 50.0)
+
+    def test_fused_kpis(self):
+        """Test that stream_kpis adds every KPI column at once, matching the single-KPI methods."""
+        kpis = [
+            {'kpi': 'revenue_growth', 'revenue_col': 'revenue'},
+            {'kpi': 'churn_rate', 'start_col': 'start_customers', 'end_col': 'end_customers'},
+            {'kpi': 'growth_rate', 'start_col': 'start_customers', 'end_col': 'end_customers',
+             'new_col_name': 'customer_growth'}
+        ]
+        result = StreamKpiCalculations.stream_kpis(self.df, kpis)
+        self.assertEqual(list(result.columns), list(self.df.columns) + ['revenue_growth', 'churn_rate',
+                                                                        'customer_growth'])
+        self.assertEqual(len(self.df.columns), 3)
+        expected = StreamKpiCalculations.stream_growth_rate(self.df.copy(), 'start_customers', 'end_customers')
+        self.assertEqual(result['customer_growth'].tolist(), expected['growth_rate'].tolist())
+        arrays = StreamKpiCalculations.stream_kpis(self.df, kpis, output='array')
+        np.testing.assert_array_equal(arrays['churn_rate'], result['churn_rate'].to_numpy())
+        columns = StreamKpiCalculations.stream_kpis(self.df, kpis[:1], output='columns')
+        self.assertEqual(list(columns.columns), ['revenue_growth'])
+
+    def test_grouped_revenue_growth(self):
+        """Test revenue growth within groups, in time order, against groupby().pct_change()."""
+        df = pd.DataFrame({
+            'customer': ['A', 'B', 'A', 'B', 'A', None],
+            'month': [3, 1, 1, 2, 2, 1],
+            'revenue': [1200, 500, 1000, 800, 1500, 100]
+        })
+        result = StreamKpiCalculations.stream_revenue_growth(df.copy(), 'revenue', group_cols='customer',
+                                                             order_col='month')
+        expected = (df.sort_values('month').groupby('customer')['revenue'].pct_change() * 100).round(2)
+        pd.testing.assert_series_equal(result['revenue_growth'], expected.reindex(df.index), check_names=False)
+        self.assertEqual(result['revenue_growth'].tolist()[3], 60.0)  # B: 500 in month 1, 800 in month 2
+        self.assertTrue(pd.isna(result['revenue_growth'].iloc[5]))  # null key
+
+    def test_grouped_churn_and_growth_rate(self):
+        """Test per-group churn and growth rates from the first start and last end in time order."""
+        df = pd.DataFrame({
+            'territory': ['EMEA', 'APAC', 'EMEA', 'APAC'],
+            'month': [2, 1, 1, 2],
+            'start_customers': [180, 100, 200, 90],
+            'end_customers': [150, 90, 180, 120]
+        })
+        churn = StreamKpiCalculations.stream_group_churn_rate(df, 'territory', 'start_customers',
+                                                              'end_customers', order_col='month')
+        self.assertEqual(churn['territory'].tolist(), ['APAC', 'EMEA'])
+        self.assertEqual(churn['start_customers'].tolist(), [100, 200])
+        self.assertEqual(churn['end_customers'].tolist(), [120, 150])
+        self.assertEqual(churn['churn_rate'].tolist(), [-20.0, 25.0])
+        growth = StreamKpiCalculations.stream_group_growth_rate(df, ['territory'], 'start_customers',
+                                                                'end_customers')
+        self.assertEqual(growth['growth_rate'].tolist(), [20.0, 0.0])  # row order: EMEA 180 -> 180
+
+    def test_incremental_calculator_with_snapshot(self):
+        """Test that daily batches resumed from a snapshot give the same KPIs as the full history."""
+        df = pd.DataFrame({
+            'day': [1, 1, 2, 2, 3, 3, 4],
+            'territory': ['EMEA', 'APAC', 'EMEA', 'APAC', 'APAC', 'EMEA', 'EMEA'],
+            'revenue': [1000, 500, 1500, 400, 600, 1200, 1800],
+            'start_customers': [200, 100, 210, 95, 90, 220, 205],
+            'end_customers': [190, 95, 205, 90, 85, 210, 200]
+        })
+        expected = StreamKpiCalculations.stream_revenue_growth(df.copy(), 'revenue', group_cols='territory',
+                                                               order_col='day')
+        expected_churn = StreamKpiCalculations.stream_group_churn_rate(df, 'territory', 'start_customers',
+                                                                       'end_customers', order_col='day')
+        calculator = IncrementalKpiCalculator('revenue', 'start_customers', 'end_customers',
+                                              group_cols='territory', order_col='day')
+        growth = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'kpi_state.json')
+            for day in range(1, 5):
+                growth.extend(calculator.update(df[df['day'] == day], output='array').tolist())
+                calculator.save(path)
+                calculator = IncrementalKpiCalculator.load(path)
+        self.assertEqual(growth[2:], expected['revenue_growth'].tolist()[2:])
+        self.assertEqual(calculator.watermark, 4)
+        pd.testing.assert_frame_equal(calculator.churn_rates(), expected_churn, check_dtype=False)
+        # Rows up to the watermark were already processed
+        self.assertEqual(len(calculator.update(df, output='array')), 0)
+
+    def test_incremental_calculator_shared_order_value(self):
+        """Test that batches sharing an order value are all counted, while a batch sent twice is not."""
+        df = pd.DataFrame({
+            'd': [1, 1, 1, 2, np.nan],
+            'g': ['a', 'b', 'a', 'a', 'a'],
+            'start_customers': [100, 50, 120, 110, 10],
+            'end_customers': [90, 45, 85, 95, 5]
+        })
+        calculator = IncrementalKpiCalculator(start_col='start_customers', end_col='end_customers',
+                                              group_cols='g', order_col='d')
+        calculator.update(df.iloc[:2])
+        calculator = IncrementalKpiCalculator.from_snapshot(calculator.to_snapshot())
+        calculator.update(df.iloc[:3])  # rows 0 and 1 again, with a new row at d=1
+        self.assertEqual(calculator.churn_rates()['churn_rate'].tolist(), [15.0, 10.0])
+        calculator.update(df.iloc[2:])  # row 2 again, a row at d=2 and a row without an order value
+        expected = StreamKpiCalculations.stream_group_churn_rate(df.iloc[:4], 'g', 'start_customers',
+                                                                 'end_customers', order_col='d')
+        pd.testing.assert_frame_equal(calculator.churn_rates(), expected, check_dtype=False)
+        self.assertEqual(calculator.churn_rates()['churn_rate'].tolist(), [5.0, 10.0])
+
+    def test_incremental_calculator_without_groups(self):
+        """Test the incremental revenue growth of a single series across batches."""
+        calculator = IncrementalKpiCalculator('revenue')
+        first = calculator.update(self.df.iloc[:2].copy())
+        second = calculator.update(self.df.iloc[2:].copy())
+        expected = StreamKpiCalculations.stream_revenue_growth(self.df.copy(), 'revenue')
+        self.assertEqual(pd.concat([first, second])['revenue_growth'].tolist()[1:],
+                         expected['revenue_growth'].tolist()[1:])
+        snapshot = IncrementalKpiCalculator.from_snapshot(calculator.to_snapshot())
+        self.assertEqual(snapshot.update([{'revenue': 3400}], output='array')[0], 100.0)
+
+    def test_iter_revenue_growth_records(self):
+        """Test that the generator yields the same growth as the DataFrame method, row by row."""
+        expected = StreamKpiCalculations.stream_revenue_growth(self.df.copy(), 'revenue')['revenue_growth']
+        records = self.df.to_dict('records')
+        result = list(StreamKpiCalculations.iter_revenue_growth(records, 'revenue'))
+        self.assertTrue(np.isnan(result[0]))
+        self.assertEqual(result[1:], expected.tolist()[1:])
+        self.assertEqual(list(StreamKpiCalculations.iter_revenue_growth(self.data['revenue']))[1:],
+                         expected.tolist()[1:])
+
+    def test_iter_revenue_growth_micro_batches(self):
+        """Test that the previous revenue is carried across micro-batch boundaries."""
+        expected = StreamKpiCalculations.stream_revenue_growth(self.df.copy(), 'revenue')['revenue_growth']
+        batches = [self.df.iloc[:2], self.df.iloc[2:2], self.df.iloc[2:], {'revenue': 850}]
+        result = list(StreamKpiCalculations.iter_revenue_growth(batches, 'revenue'))
+        self.assertEqual(len(result[1]), 0)
+        np.testing.assert_array_equal(np.concatenate(result[:3]), expected.to_numpy())
+        self.assertEqual(result[3], -50.0)
+
+    def test_iter_churn_and_growth_rate(self):
+        """Test that the churn and growth rate generators match the DataFrame methods."""
+        records = self.df.to_dict('records')
+        churn = StreamKpiCalculations.stream_churn_rate(self.df.copy(), 'start_customers', 'end_customers')
+        growth = StreamKpiCalculations.stream_growth_rate(self.df.copy(), 'start_customers', 'end_customers')
+        self.assertEqual(list(StreamKpiCalculations.iter_churn_rate(records, 'start_customers', 'end_customers')),
+                         churn['churn_rate'].tolist())
+        batches = [self.df.iloc[:3], self.df.iloc[3:]]
+        result = StreamKpiCalculations.iter_growth_rate(batches, 'start_customers', 'end_customers')
+        np.testing.assert_array_equal(np.concatenate(list(result)), growth['growth_rate'].to_numpy())
+
     # ==========================
     # Edge cases and invalid input tests
     # ==========================
@@ -55,6 +209,39 @@ class TestStreamKpiCalculations(unittest.TestCase):
         with self.assertRaises(ValueError):
             StreamKpiCalculations.stream_revenue_growth(self.df, 'non_existent_column', 'revenue_growth')
 
+    def test_iter_kpi_invalid_record(self):
+        with self.assertRaises(ValueError):
+            list(StreamKpiCalculations.iter_revenue_growth([{'sales': 10}], 'revenue'))
+        with self.assertRaises(ValueError):
+            list(StreamKpiCalculations.iter_revenue_growth(['abc']))
+        with self.assertRaises(ValueError):
+            list(StreamKpiCalculations.iter_churn_rate([self.df.iloc[:2]], 'start_customers', 'missing'))
+
+    def test_grouped_kpi_invalid_column(self):
+        with self.assertRaises(ValueError):
+            StreamKpiCalculations.stream_revenue_growth(self.df, 'revenue', group_cols='missing')
+        with self.assertRaises(ValueError):
+            StreamKpiCalculations.stream_group_churn_rate(self.df, 'revenue', 'start_customers',
+                                                          'end_customers', order_col='missing')
+
+    def test_invalid_output(self):
+        with self.assertRaises(ValueError):
+            StreamKpiCalculations.stream_revenue_growth(self.df, 'revenue', output='list')
+        with self.assertRaises(ValueError):
+            StreamKpiCalculations.stream_kpis(self.df, [{'kpi': 'margin'}])
+        with self.assertRaises(ValueError):
+            StreamKpiCalculations.stream_kpis(self.df, [{'kpi': 'revenue_growth', 'revenue_col': 'revenue'}] * 2)
+
+    def test_incremental_calculator_invalid_input(self):
+        with self.assertRaises(ValueError):
+            IncrementalKpiCalculator(start_col='start_customers')
+        with self.assertRaises(ValueError):
+            IncrementalKpiCalculator('revenue').churn_rates()
+        with self.assertRaises(ValueError):
+            IncrementalKpiCalculator('missing').update(self.df)
+        with self.assertRaises(ValueError):
+            IncrementalKpiCalculator.from_snapshot({'version': 99})
+
 def main():
     unittest.main(argv=['first-arg-is-ignored'], exit=False, verbosity=3)
 
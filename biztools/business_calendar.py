@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+class BusinessCalendar:
+    """
+    Business-day calendar with a weekmask and a set of holidays (e.g. the public holidays of one country).
+
+    Keeps a sorted index of the business days as day ordinals (days since 1970-01-01), so offsets and
+    counts for whole date columns are answered with np.searchsorted instead of per-row offset arithmetic.
+    The index covers `start` to `end` and grows when dates outside that span are looked up.
+    """
+
+    def __init__(self, holidays=None, weekmask='Mon Tue Wed Thu Fri', start='1970-01-01', end='2100-12-31'):
+        try:
+            holidays = pd.to_datetime(pd.Series(holidays if holidays is not None else [], dtype=object))
+        except (ValueError, TypeError):
+            raise ValueError("Holidays must be a list of dates.")
+        holidays = holidays.dropna().to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        self.holidays = np.unique(holidays)
+        try:
+            self._busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+        except ValueError:
+            raise ValueError(f"Invalid weekmask: {weekmask}.")
+        if not self._busdaycal.weekmask.any():
+            raise ValueError("The weekmask must contain at least one business day.")
+        self.weekmask = weekmask
+        self._first = self._last = None
+        self._ordinals = np.empty(0, dtype=np.int64)
+        self._extend(np.datetime64(pd.Timestamp(start).date(), 'D').astype(np.int64),
+                     np.datetime64(pd.Timestamp(end).date(), 'D').astype(np.int64))
+
+    @classmethod
+    def from_file(cls, path, country=None, date_column='date', country_column='country', **kwargs):
+        """
+        Loads the holidays from a local CSV file with a `date_column` and, for files holding several
+        countries, a `country_column` used to keep only the holidays of `country`. A file with a single
+        column is read as one date per line.
+        """
+        holidays = pd.read_csv(path)
+        if date_column not in holidays.columns:
+            if holidays.shape[1] != 1:
+                raise ValueError(f"Column '{date_column}' does not exist in the holiday file.")
+            holidays = pd.read_csv(path, header=None, names=[date_column])
+        if country is not None:
+            if country_column not in holidays.columns:
+                raise ValueError(f"Column '{country_column}' does not exist in the holiday file.")
+            holidays = holidays[holidays[country_column] == country]
+        return cls(holidays[date_column].tolist(), **kwargs)
+
+    def _extend(self, first, last):
+        """Grows the business-day index to cover the day ordinals first..last (with a year of margin)."""
+        if self._first is not None and first >= self._first and last <= self._last:
+            return
+        if self._first is not None:
+            first = min(first, self._first) - 366
+            last = max(last, self._last) + 366
+        days = np.arange(first, last + 1).astype('datetime64[D]')
+        self._ordinals = days[np.is_busday(days, busdaycal=self._busdaycal)].astype(np.int64)
+        self._first, self._last = first, last
+
+    @staticmethod
+    def _split(dates):
+        """Splits a datetime Series into day ordinals and times of day (local wall time for tz-aware data)."""
+        dates = pd.to_datetime(pd.Series(dates))
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        values = dates.to_numpy(dtype='datetime64[ns]')
+        days = values.astype('datetime64[D]')
+        return days, values - days
+
+    def _lookup(self, days):
+        """Returns the day ordinals of the non-null days, extending the index to cover them."""
+        valid = ~np.isnat(days)
+        ordinals = days[valid].astype(np.int64)
+        if len(ordinals) > 0:
+            # Offsets may step past the dates themselves, keep a margin of business days around them
+            self._extend(ordinals.min() - 366, ordinals.max() + 366)
+        return valid, ordinals
+
+    def is_business_day(self, dates):
+        """Returns a boolean array, True where the date is a business day (False for nulls)."""
+        days, _ = self._split(dates)
+        valid = ~np.isnat(days)
+        result = np.zeros(len(days), dtype=bool)
+        result[valid] = np.is_busday(days[valid], busdaycal=self._busdaycal)
+        return result
+
+    def offset(self, dates, num_days):
+        """
+        Moves every date by `num_days` business days, like adding CustomBusinessDay(num_days) with this
+        calendar's holidays: the n-th business day after the date (or before it, for negative num_days),
+        keeping the time of day. Nulls stay null.
+
+        Returns:
+            np.ndarray: datetime64[ns] values.
+        """
+        days, times = self._split(dates)
+        valid, ordinals = self._lookup(days)
+        while True:
+            if num_days > 0:
+                positions = np.searchsorted(self._ordinals, ordinals, side='right') + num_days - 1
+            else:
+                positions = np.searchsorted(self._ordinals, ordinals, side='left') + num_days
+            if len(positions) == 0 or (positions.min() >= 0 and positions.max() < len(self._ordinals)):
+                break
+            # Large offsets can step out of the index, grow it by enough calendar days to cover them
+            span = abs(num_days) * 7 // int(self._busdaycal.weekmask.sum()) + 366
+            self._extend(self._first - span, self._last + span)
+        result = np.full(len(days), np.datetime64('NaT'), dtype='datetime64[ns]')
+        result[valid] = self._ordinals[positions].astype('datetime64[D]') + times[valid]
+        return result
+
+    def count(self, start_dates, end_dates):
+        """
+        Counts business days like len(pd.bdate_range(start, end, freq=calendar)) - 1 for every pair of
+        dates: the business days in [start date, end date] minus one, or -1 when start is after end.
+
+        Returns:
+            np.ndarray: int64 counts, or float64 with NaN where either date is null.
+        """
+        start_days, _ = self._split(start_dates)
+        end_days, _ = self._split(end_dates)
+        valid = ~(np.isnat(start_days) | np.isnat(end_days))
+        start_ordinals = start_days[valid].astype(np.int64)
+        end_ordinals = end_days[valid].astype(np.int64)
+        if len(start_ordinals) > 0:
+            self._extend(min(start_ordinals.min(), end_ordinals.min()), max(start_ordinals.max(), end_ordinals.max()))
+        inside = (np.searchsorted(self._ordinals, end_ordinals, side='right')
+                  - np.searchsorted(self._ordinals, start_ordinals, side='left'))
+        counts = np.full(len(start_days), -1, dtype=np.int64)
+        counts[valid] = np.where(start_ordinals <= end_ordinals, inside - 1, -1)
+        if len(counts) > 0 and valid.all():
+            return counts
+        counts = counts.astype(float)
+        counts[~valid] = np.nan
+        return counts
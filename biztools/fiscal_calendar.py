@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.offsets import FY5253
+
+class FiscalCalendar:
+    """
+    Fiscal calendar mapping dates to fiscal year, quarter, period (fiscal month) and week.
+
+    Either month based, with the fiscal year starting on the first day of `start_month`, or week based
+    (52/53-week years such as 4-4-5 retail calendars) when a `pattern` is given: the fiscal year then
+    ends on the last `week_end` weekday of the month before `start_month` (or the one nearest to the end
+    of that month with variation='nearest'), and every quarter has 13 weeks split into periods by the
+    pattern. The 53rd week of a long year belongs to the last period.
+
+    The fiscal fields of every day from `start` to `end` are precomputed in a table indexed by day
+    ordinal (days since 1970-01-01), so a whole date column is mapped with a single gather. The table
+    grows when dates outside that span are looked up.
+    """
+
+    FIELDS = ('year', 'quarter', 'period', 'week')
+    _WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+    def __init__(self, start_month=1, pattern=None, week_end='Sat', variation='last', year_label='end',
+                 start='1970-01-01', end='2100-12-31'):
+        if start_month not in range(1, 13):
+            raise ValueError("start_month must be an integer between 1 and 12.")
+        if year_label not in ('start', 'end'):
+            raise ValueError("year_label must be 'start' or 'end'.")
+        self.start_month = start_month
+        self.year_label = year_label
+        self.pattern = self._parse_pattern(pattern)
+        if self.pattern is not None:
+            if week_end not in self._WEEKDAYS:
+                raise ValueError(f"week_end must be one of: {', '.join(self._WEEKDAYS)}.")
+            if variation not in ('last', 'nearest'):
+                raise ValueError("variation must be 'last' or 'nearest'.")
+        self.week_end = week_end
+        self.variation = variation
+        self._first = self._last = None
+        self._table = np.empty((0, len(self.FIELDS)), dtype=np.int16)
+        self._extend(np.datetime64(pd.Timestamp(start).date(), 'D').astype(np.int64),
+                     np.datetime64(pd.Timestamp(end).date(), 'D').astype(np.int64))
+
+    @staticmethod
+    def _parse_pattern(pattern):
+        """Returns the weeks of the three periods of a quarter, e.g. '4-4-5' -> (4, 4, 5), or None."""
+        if pattern is None:
+            return None
+        try:
+            weeks = tuple(int(weeks) for weeks in (pattern.split('-') if isinstance(pattern, str) else pattern))
+        except (TypeError, ValueError):
+            raise ValueError("pattern must look like '4-4-5'.")
+        if len(weeks) != 3 or sum(weeks) != 13 or min(weeks) < 1:
+            raise ValueError("pattern must have three periods adding up to the 13 weeks of a quarter.")
+        return weeks
+
+    def _year_bounds(self, days):
+        """Returns the first day and the label of the fiscal year of every day (datetime64[D])."""
+        if self.pattern is None:
+            months = days.astype('datetime64[M]').astype(np.int64)
+            # Months since the first fiscal month of 1970, floored to whole years
+            first_months = (months - (self.start_month - 1)) // 12 * 12 + (self.start_month - 1)
+            starts = first_months.astype('datetime64[M]').astype('datetime64[D]')
+            start_years = first_months // 12 + 1970
+            labels = start_years + (1 if self.year_label == 'end' and self.start_month != 1 else 0)
+            return starts, labels
+        end_month = (self.start_month - 2) % 12 + 1
+        offset = FY5253(weekday=self._WEEKDAYS.index(self.week_end), startingMonth=end_month,
+                        variation=self.variation)
+        # Year ends covering the span with a year of margin on both sides
+        year_ends = pd.date_range(pd.Timestamp(days[0]) - pd.Timedelta(days=400),
+                                  pd.Timestamp(days[-1]) + pd.Timedelta(days=400), freq=offset)
+        year_ends = year_ends.to_numpy().astype('datetime64[D]')
+        positions = np.searchsorted(year_ends, days, side='left')
+        starts = year_ends[positions - 1] + np.timedelta64(1, 'D')
+        ends = year_ends[positions]
+        labels = (ends if self.year_label == 'end' else starts).astype('datetime64[Y]').astype(np.int64) + 1970
+        return starts, labels
+
+    def _extend(self, first, last):
+        """Rebuilds the lookup table to cover the day ordinals first..last (with a year of margin)."""
+        if self._first is not None and first >= self._first and last <= self._last:
+            return
+        if self._first is not None:
+            first = min(first, self._first) - 366
+            last = max(last, self._last) + 366
+        days = np.arange(first, last + 1).astype('datetime64[D]')
+        starts, labels = self._year_bounds(days)
+        weeks = (days - starts).astype(np.int64) // 7
+        if self.pattern is None:
+            periods = (days.astype('datetime64[M]') - starts.astype('datetime64[M]')).astype(np.int64)
+            quarters = periods // 3
+        else:
+            quarters = np.minimum(weeks // 13, 3)
+            boundaries = np.cumsum(self.pattern)[:-1]
+            periods = quarters * 3 + np.searchsorted(boundaries, weeks - quarters * 13, side='right')
+        self._table = np.column_stack([labels, quarters + 1, periods + 1, weeks + 1]).astype(np.int16)
+        self._first, self._last = first, last
+
+    def lookup(self, dates):
+        """
+        Maps dates to their fiscal fields (local dates for tz-aware data).
+
+        Returns:
+            np.ndarray: One row per date and one column per field of FIELDS, int16, or float64 with NaN
+            in the rows of null dates.
+        """
+        dates = pd.to_datetime(pd.Series(dates))
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        days = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        valid = ~np.isnat(days)
+        ordinals = days[valid].astype(np.int64)
+        if len(ordinals) > 0:
+            self._extend(ordinals.min(), ordinals.max())
+        if valid.all():
+            return self._table[ordinals - self._first]
+        fields = np.full((len(days), len(self.FIELDS)), np.nan)
+        fields[valid] = self._table[ordinals - self._first]
+        return fields
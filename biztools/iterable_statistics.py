@@ -1,13 +1,76 @@
+import heapq
 import math
 from collections import Counter
+import numpy as np
 
 class IterableStatistics:
+    @staticmethod
+    def _numeric_buffer(iterables):
+        """
+        Returns a zero-copy 1-D NumPy view of numeric array-like inputs (numpy.ndarray, pandas Series,
+        array.array or any other buffer-protocol object), or None if the input has to be iterated in Python.
+        """
+        if isinstance(iterables, np.ndarray):
+            values = iterables
+        elif hasattr(iterables, 'to_numpy'):
+            values = iterables.to_numpy()
+        else:
+            try:
+                values = np.asarray(memoryview(iterables))
+            except TypeError:
+                return None
+        if values.ndim != 1 or values.dtype.kind not in 'iufb':
+            return None
+        return values
+
+    @staticmethod
+    def _array_sum(values):
+        """
+        Sums a numeric array with the same result as sum() on its items: integer arrays whose sum could
+        overflow NumPy's 64-bit accumulator are summed on Python ints.
+        """
+        if values.dtype.kind in 'iu' and len(values) > 0:
+            bound = max(abs(values.min().item()), abs(values.max().item()))
+            if bound * len(values) > np.iinfo(np.uint64 if values.dtype.kind == 'u' else np.int64).max:
+                return sum(values.tolist())
+        return values.sum().item()
+
     @staticmethod
     def _filter_valid(iterables):
         """
         Filters out None and NaN values from the iterable.
+
+        Numeric buffers are returned as a NumPy array without boxing each element; the data is only
+        copied when NaN values have to be dropped.
         """
+        values = IterableStatistics._numeric_buffer(iterables)
+        if values is not None:
+            if values.dtype.kind == 'f':
+                nan_mask = np.isnan(values)
+                if nan_mask.any():
+                    return values[~nan_mask]
+            return values
         return [x for x in iterables if x is not None and not (isinstance(x, float) and math.isnan(x))]
+
+    @staticmethod
+    def _select_median(valid_items):
+        """
+        Returns the median in linear time by partitioning around the middle element(s) instead of sorting.
+        The middle elements are taken from the input list, so their type is preserved.
+        """
+        n = len(valid_items)
+        middle = n // 2
+        if any(isinstance(x, int) and abs(x) > 2 ** 53 for x in valid_items):
+            # Such ints are not exact as floats and would be merged by the partition, sort them instead
+            ordered = sorted(valid_items)
+            if n % 2 != 0:
+                return ordered[middle]
+            return (ordered[middle - 1] + ordered[middle]) / 2
+        values = np.fromiter(valid_items, dtype=float, count=n)
+        if n % 2 != 0:
+            return valid_items[np.argpartition(values, middle)[middle]]
+        order = np.argpartition(values, [middle - 1, middle])
+        return (valid_items[order[middle - 1]] + valid_items[order[middle]]) / 2
     
     # 1. Count
     @staticmethod
@@ -19,8 +82,10 @@ class IterableStatistics:
     @staticmethod
     def iterable_mode(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. Mode cannot be calculated.")
+        if isinstance(valid_items, np.ndarray):
+            valid_items = valid_items.tolist()
         counts = Counter(valid_items)
         max_count = max(counts.values())
         return [k for k, v in counts.items() if v == max_count]
@@ -29,31 +94,36 @@ class IterableStatistics:
     @staticmethod
     def iterable_mean_median(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. Mean and median cannot be calculated.")
+        if isinstance(valid_items, np.ndarray):
+            return valid_items.mean().item(), np.median(valid_items).item()
         if not all(isinstance(i, (int, float)) for i in valid_items):
             raise TypeError("All elements in the iterable must be numeric.")
         
-        valid_items.sort()
-        n = len(valid_items)
-        mean = sum(valid_items) / n
-        median = valid_items[n // 2] if n % 2 != 0 else (valid_items[n // 2 - 1] + valid_items[n // 2]) / 2
+        mean = sum(valid_items) / len(valid_items)
+        median = IterableStatistics._select_median(valid_items)
         return mean, median
 
     # 4. Minimum and Maximum
     @staticmethod
     def iterable_min_max(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. Min and max cannot be calculated.")
+        if isinstance(valid_items, np.ndarray):
+            return valid_items.min().item(), valid_items.max().item()
         return min(valid_items), max(valid_items)
 
     # 5. Standard Deviation and Variance
     @staticmethod
     def iterable_std_var(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. Standard deviation and variance cannot be calculated.")
+        if isinstance(valid_items, np.ndarray):
+            var = valid_items.var().item()
+            return var ** 0.5, var
         n = len(valid_items)
         mean = sum(valid_items) / n
         var = sum((x - mean) ** 2 for x in valid_items) / n
@@ -64,8 +134,10 @@ class IterableStatistics:
     @staticmethod
     def iterable_mad(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. Mean absolute deviation cannot be calculated.")
+        if isinstance(valid_items, np.ndarray):
+            return np.abs(valid_items - valid_items.mean()).mean().item()
         n = len(valid_items)
         mean = sum(valid_items) / n
         mad = sum(abs(x - mean) for x in valid_items) / n
@@ -75,8 +147,11 @@ class IterableStatistics:
     @staticmethod
     def iterable_prod(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. Product cannot be calculated.")
+        if isinstance(valid_items, np.ndarray):
+            # Integer products are computed on Python ints so they cannot overflow
+            return valid_items.prod().item() if valid_items.dtype.kind == 'f' else math.prod(valid_items.tolist())
         prod = 1
         for val in valid_items:
             prod *= val
@@ -86,14 +161,175 @@ class IterableStatistics:
     @staticmethod
     def iterable_sum(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. Sum cannot be calculated.")
+        if isinstance(valid_items, np.ndarray):
+            return IterableStatistics._array_sum(valid_items)
         return sum(valid_items)
 
     # 9. First and Last
     @staticmethod
     def iterable_first_last(iterables):
         valid_items = IterableStatistics._filter_valid(iterables)
-        if not valid_items:
+        if len(valid_items) == 0:
             raise ValueError("Input iterable is empty or contains only invalid values. First and last elements cannot be retrieved.")
+        if isinstance(valid_items, np.ndarray):
+            return valid_items[0].item(), valid_items[-1].item()
         return valid_items[0], valid_items[-1]
+
+    # 10. Single-pass summary
+    @staticmethod
+    def iterable_summary(iterables):
+        accumulator = OnlineAccumulator(iterables)
+        if accumulator.count == 0:
+            raise ValueError("Input iterable is empty or contains only invalid values. Summary cannot be calculated.")
+        return accumulator.summary()
+
+    # 11. Running Median
+    @staticmethod
+    def iterable_running_median(iterables):
+        """
+        Yields the median of the values seen so far after each valid value of a stream.
+        """
+        running = RunningMedian()
+        for value in iterables:
+            if running.push(value):
+                yield running.median()
+
+
+class RunningMedian:
+    """
+    Exact running median of a stream kept in two heaps: a max-heap with the lower half of the values
+    and a min-heap with the upper half. Each value is stored once and pushing costs O(log n), so the
+    median is available at any time without materializing and sorting the stream.
+    """
+
+    def __init__(self):
+        self._lower = []  # max-heap (negated values)
+        self._upper = []  # min-heap
+
+    def push(self, value):
+        """Adds a value. Returns False if it was skipped (None or NaN)."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return False
+        if not isinstance(value, (int, float)):
+            raise TypeError("All elements in the iterable must be numeric.")
+        if self._lower and value > -self._lower[0]:
+            heapq.heappush(self._upper, value)
+        else:
+            heapq.heappush(self._lower, -value)
+        # Rebalance so the lower half holds the extra element when the count is odd
+        if len(self._lower) > len(self._upper) + 1:
+            heapq.heappush(self._upper, -heapq.heappop(self._lower))
+        elif len(self._upper) > len(self._lower):
+            heapq.heappush(self._lower, -heapq.heappop(self._upper))
+        return True
+
+    def median(self):
+        """Returns the median of the values pushed so far."""
+        if not self._lower:
+            raise ValueError("No valid values were pushed. Median cannot be calculated.")
+        if len(self._lower) > len(self._upper):
+            return -self._lower[0]
+        return (-self._lower[0] + self._upper[0]) / 2
+
+
+class OnlineAccumulator:
+    """
+    Consumes an iterable once, in O(1) memory, and keeps count, sum, min, max, first, last, product,
+    mean and variance (Welford). None and NaN values are skipped like in IterableStatistics.
+
+    Accumulators built over different shards can be combined with merge(); the shard passed to
+    merge() is treated as coming after this one for first and last.
+    """
+
+    def __init__(self, iterables=None):
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+        self.first = None
+        self.last = None
+        self.product = 1
+        self.mean = 0.0
+        self._m2 = 0.0
+        if iterables is not None:
+            self.consume(iterables)
+
+    def update(self, value):
+        """Adds a single value."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return
+        if not isinstance(value, (int, float)):
+            raise TypeError("All elements in the iterable must be numeric.")
+        self.count += 1
+        self.sum += value
+        self.product *= value
+        if self.count == 1:
+            self.first = self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.last = value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def consume(self, iterables):
+        """Adds every value of an iterable (or iterator), reading it once."""
+        if IterableStatistics._numeric_buffer(iterables) is not None:
+            return self.merge(OnlineAccumulator._from_array(IterableStatistics._filter_valid(iterables)))
+        for value in iterables:
+            self.update(value)
+        return self
+
+    @staticmethod
+    def _from_array(values):
+        """Builds an accumulator from a NaN-free numeric array with vectorized reductions."""
+        accumulator = OnlineAccumulator()
+        if len(values) == 0:
+            return accumulator
+        accumulator.count = len(values)
+        accumulator.sum = IterableStatistics._array_sum(values)
+        accumulator.min, accumulator.max = values.min().item(), values.max().item()
+        accumulator.first, accumulator.last = values[0].item(), values[-1].item()
+        accumulator.product = values.prod().item() if values.dtype.kind == 'f' else math.prod(values.tolist())
+        accumulator.mean = values.mean().item()
+        accumulator._m2 = ((values - accumulator.mean) ** 2).sum().item()
+        return accumulator
+
+    def merge(self, other):
+        """Folds the statistics of another accumulator into this one."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.first, self.min, self.max = other.first, other.min, other.max
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.sum += other.sum
+        self.product *= other.product
+        self.last = other.last
+        return self
+
+    def std_var(self):
+        """Returns the population standard deviation and variance."""
+        if self.count == 0:
+            raise ValueError("No valid values were accumulated. Standard deviation and variance cannot be calculated.")
+        var = self._m2 / self.count
+        return var ** 0.5, var
+
+    def summary(self):
+        """Returns every accumulated statistic as a dictionary."""
+        std, var = self.std_var()
+        return {
+            'count': self.count, 'sum': self.sum, 'min': self.min, 'max': self.max,
+            'first': self.first, 'last': self.last, 'product': self.product,
+            'mean': self.mean, 'std': std, 'var': var
+        }
@@ -1,6 +1,10 @@
+import numpy as np
 import pandas as pd
 from pandas.tseries.offsets import BDay
+from pandas.tseries.api import guess_datetime_format
 from collections.abc import Iterable
+from biztools.business_calendar import BusinessCalendar
+from biztools.fiscal_calendar import FiscalCalendar
 
 class IteratorDateUtils:
     @staticmethod
@@ -30,14 +34,54 @@ class IteratorDateUtils:
 
         return df
 
+    _WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+    @staticmethod
+    def _parse_dates(values, formats=None, date_col=None):
+        """
+        Converts a column to datetime64. Datetime columns are returned as they are. String columns are
+        parsed once per distinct value (date columns repeat the same days), with the format inferred
+        from the first value as pd.to_datetime does.
+
+        `formats` is a dict of formats by column name owned by the caller (iter_enrich keeps one per
+        stream): the cached format of `date_col` is tried first so later chunks skip inference, and
+        inference runs again when the chunk does not match it.
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        if not pd.api.types.is_string_dtype(values):
+            return pd.to_datetime(values)
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Index(uniques, dtype=object)
+        parsed = None
+        cached = formats.get(date_col) if formats is not None else None
+        if cached is not None:
+            try:
+                parsed = pd.to_datetime(uniques, format=cached)
+            except (ValueError, TypeError):
+                pass
+        if parsed is None:
+            parsed = pd.to_datetime(uniques)
+            if formats is not None and len(uniques) > 0 and isinstance(uniques[0], str):
+                # The distinct values keep their order, so uniques[0] is the value pandas inferred from
+                date_format = guess_datetime_format(uniques[0])
+                if date_format is not None:
+                    formats[date_col] = date_format
+        # Nulls have code -1 and come back as NaT
+        return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=values.index, name=values.name)
+
     @staticmethod
-    def _validate_date_column(df, date_col):
+    def _validate_date_column(df, date_col, formats=None):
         """
         Validates that the specified column exists in the dataframe and contains valid dates.
 
         Args:
             df (pd.DataFrame): Input dataframe.
             date_col (str): Column name to validate.
+            formats (dict, optional): Date formats by column name cached by the caller (see _parse_dates).
+
+        Returns:
+            pd.Series: The column converted to datetime64, to be reused instead of parsing it again.
 
         Raises:
             ValueError: If the column does not exist or contains invalid dates.
@@ -46,12 +90,57 @@ class IteratorDateUtils:
             raise ValueError(f"Column '{date_col}' does not exist in the dataframe.")
         
         try:
-            pd.to_datetime(df[date_col])
+            return IteratorDateUtils._parse_dates(df[date_col], formats, date_col)
         except Exception:
             raise ValueError(f"Column '{date_col}' does not contain valid date values.")
 
     @staticmethod
-    def business_days_between_rows(data, date_column='delivery_start_date', new_col_name="business_days_to_previous"):
+    def _to_days(dates):
+        """Returns the calendar dates of a datetime Series as datetime64[D] (local dates for tz-aware data)."""
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        return dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+
+    @staticmethod
+    def _validate_calendar(calendar):
+        if calendar is not None and not isinstance(calendar, BusinessCalendar):
+            raise ValueError("Calendar must be a BusinessCalendar.")
+
+    @staticmethod
+    def _calendar_offset(dates, num_days, calendar):
+        """Moves a datetime Series by num_days business days of the calendar, keeping its index and timezone."""
+        shifted = pd.Series(calendar.offset(dates, num_days), index=dates.index)
+        if dates.dt.tz is not None:
+            shifted = shifted.dt.tz_localize(dates.dt.tz)
+        return shifted
+
+    @staticmethod
+    def _business_day_counts(start, end, calendar=None):
+        """
+        Counts business days like len(pd.bdate_range(start, end)) - 1 for every pair of dates at once:
+        the weekdays in [start date, end date] minus one, or -1 when start is after end. With a
+        BusinessCalendar, its holidays and weekmask are used.
+
+        Returns:
+            np.ndarray: int64 counts, or float64 with NaN where either date is null.
+        """
+        if calendar is not None:
+            return calendar.count(start, end)
+        start_days = IteratorDateUtils._to_days(pd.to_datetime(start))
+        end_days = IteratorDateUtils._to_days(pd.to_datetime(end))
+        valid = ~(np.isnat(start_days) | np.isnat(end_days))
+        counts = np.full(len(start_days), -1, dtype=np.int64)
+        forward = valid & (start_days <= end_days)
+        counts[forward] = np.busday_count(start_days[forward], end_days[forward] + np.timedelta64(1, 'D')) - 1
+        if len(counts) > 0 and valid.all():
+            return counts
+        counts = counts.astype(float)
+        counts[~valid] = np.nan
+        return counts
+
+    @staticmethod
+    def business_days_between_rows(data, date_column='delivery_start_date', new_col_name="business_days_to_previous",
+                                   calendar=None):
         """
         Adds a column to the dataframe (or returns a new iterable) with the count of business days 
         to the previous row.
@@ -60,28 +149,22 @@ class IteratorDateUtils:
             data (Iterable): Input data containing dates (list, tuple, Series, or DataFrame).
             date_column (str): The name of the date column in the data.
             new_col_name (str): Name for the new column to be added.
+            calendar (BusinessCalendar, optional): Calendar with holidays; weekends only otherwise.
 
         Returns:
             pd.DataFrame: DataFrame with the business days to the previous row column.
         """
         # Validate the iterable and check if the date column exists
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, date_column)
+        dates = IteratorDateUtils._validate_date_column(df, date_column)
+        IteratorDateUtils._validate_calendar(calendar)
         
         # Shift dates upward to align with the previous row
-        df['previous_date'] = df[date_column].shift(1)  
-
-        # Apply business days calculation
-        df[new_col_name] = df.apply(
-            lambda row: pd.bdate_range(start=row['previous_date'], end=row[date_column]).size - 1
-            if pd.notnull(row['previous_date']) else None,
-            axis=1
-        )
-        df.drop(columns=['previous_date'], inplace=True)  # Remove the helper column
+        df[new_col_name] = IteratorDateUtils._business_day_counts(dates.shift(1), dates, calendar)
         return df
 
     @staticmethod
-    def iter_next_working_day(data, date_column, new_col_name="next_working_day"):
+    def iter_next_working_day(data, date_column, new_col_name="next_working_day", calendar=None):
         """
         Adds a column to the dataframe (or returns a new iterable) with the next working day for each date.
 
@@ -89,20 +172,25 @@ class IteratorDateUtils:
             data (Iterable): Input data containing dates (list, tuple, Series, or DataFrame).
             date_column (str): The name of the date column to be processed.
             new_col_name (str): Name for the new column to be added.
+            calendar (BusinessCalendar, optional): Calendar with holidays; weekends only otherwise.
 
         Returns:
             pd.DataFrame: DataFrame with the next working day column.
         """
         # Validate the iterable and check if the date column exists
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, date_column)
+        dates = IteratorDateUtils._validate_date_column(df, date_column)
+        IteratorDateUtils._validate_calendar(calendar)
         
         # Calculate next working day by adding one business day to the specified date column
-        df[new_col_name] = pd.to_datetime(df[date_column]) + BDay(1)
+        if calendar is not None:
+            df[new_col_name] = IteratorDateUtils._calendar_offset(dates, 1, calendar)
+        else:
+            df[new_col_name] = dates + BDay(1)
         return df
 
     @staticmethod
-    def iter_business_days(data, start_date_col, end_date_col, new_col_name="business_days_between"):
+    def iter_business_days(data, start_date_col, end_date_col, new_col_name="business_days_between", calendar=None):
         """
         Adds a column to the dataframe with the count of business days between two date columns.
 
@@ -111,23 +199,21 @@ class IteratorDateUtils:
             start_date_col (str): Name of the start date column.
             end_date_col (str): Name of the end date column.
             new_col_name (str): Name for the new column to be added.
+            calendar (BusinessCalendar, optional): Calendar with holidays; weekends only otherwise.
 
         Returns:
             pd.DataFrame: DataFrame with the business days between the two dates.
         """
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, start_date_col)
-        IteratorDateUtils._validate_date_column(df, end_date_col)
-
-        df[new_col_name] = df.apply(
-            lambda row: len(pd.bdate_range(start=row[start_date_col], end=row[end_date_col])) - 1
-            if pd.notnull(row[start_date_col]) and pd.notnull(row[end_date_col]) else None,
-            axis=1
-        )
+        start_dates = IteratorDateUtils._validate_date_column(df, start_date_col)
+        end_dates = IteratorDateUtils._validate_date_column(df, end_date_col)
+        IteratorDateUtils._validate_calendar(calendar)
+
+        df[new_col_name] = IteratorDateUtils._business_day_counts(start_dates, end_dates, calendar)
         return df
 
     @staticmethod
-    def add_business_days(data, date_col, num_days, new_col_name="date_plus_business_days"):
+    def add_business_days(data, date_col, num_days, new_col_name="date_plus_business_days", calendar=None):
         """
         Adds a specified number of business days to each date in a column.
 
@@ -136,23 +222,27 @@ class IteratorDateUtils:
             date_col (str): Name of the column containing the base dates.
             num_days (int): Number of business days to add.
             new_col_name (str): Name for the new column to be added.
+            calendar (BusinessCalendar, optional): Calendar with holidays; weekends only otherwise.
 
         Returns:
             pd.DataFrame: DataFrame with a new column of dates plus business days.
         """
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, date_col)
+        dates = IteratorDateUtils._validate_date_column(df, date_col)
+        IteratorDateUtils._validate_calendar(calendar)
         
         if num_days == 0:
             df[new_col_name] = df[date_col]  # If 0 business days, the date stays the same
+        elif calendar is not None:
+            df[new_col_name] = IteratorDateUtils._calendar_offset(dates, num_days, calendar)
         else:
-            df[new_col_name] = pd.to_datetime(df[date_col]) + BDay(num_days)
+            df[new_col_name] = dates + BDay(num_days)
         
         return df
 
 
     @staticmethod
-    def subtract_business_days(data, date_col, num_days, new_col_name="date_minus_business_days"):
+    def subtract_business_days(data, date_col, num_days, new_col_name="date_minus_business_days", calendar=None):
         """
         Subtracts a specified number of business days from each date in a column.
 
@@ -161,23 +251,27 @@ class IteratorDateUtils:
             date_col (str): Name of the column containing the base dates.
             num_days (int): Number of business days to subtract.
             new_col_name (str): Name for the new column to be added.
+            calendar (BusinessCalendar, optional): Calendar with holidays; weekends only otherwise.
 
         Returns:
             pd.DataFrame: DataFrame with a new column of dates minus business days.
         """
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, date_col)
+        dates = IteratorDateUtils._validate_date_column(df, date_col)
+        IteratorDateUtils._validate_calendar(calendar)
         
         if num_days == 0:
             df[new_col_name] = df[date_col]  # If 0 business days, the date stays the same
+        elif calendar is not None:
+            df[new_col_name] = IteratorDateUtils._calendar_offset(dates, -num_days, calendar)
         else:
-            df[new_col_name] = pd.to_datetime(df[date_col]) - BDay(num_days)
+            df[new_col_name] = dates - BDay(num_days)
         
         return df
 
 
     @staticmethod
-    def is_business_day(data, date_col, new_col_name="is_business_day"):
+    def is_business_day(data, date_col, new_col_name="is_business_day", calendar=None):
         """
         Checks if each date in a column is a business day.
 
@@ -185,17 +279,23 @@ class IteratorDateUtils:
             data (Iterable): Input data containing dates (list, tuple, Series, or DataFrame).
             date_col (str): Name of the column containing the dates to check.
             new_col_name (str): Name for the new column to be added.
+            calendar (BusinessCalendar, optional): Calendar with holidays; weekends only otherwise.
 
         Returns:
             pd.DataFrame: DataFrame with a boolean column indicating if each date is a business day.
         """
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, date_col)
-        df[new_col_name] = pd.to_datetime(df[date_col]).apply(lambda x: x.weekday() < 5)
+        dates = IteratorDateUtils._validate_date_column(df, date_col)
+        IteratorDateUtils._validate_calendar(calendar)
+        if calendar is not None:
+            df[new_col_name] = calendar.is_business_day(dates)
+        else:
+            # Monday to Friday (nulls are not business days)
+            df[new_col_name] = (dates.dt.dayofweek < 5).to_numpy()
         return df
 
     @staticmethod
-    def weekday_name(data, date_col, new_col_name="weekday_name"):
+    def weekday_name(data, date_col, new_col_name="weekday_name", categorical=False):
         """
         Adds a column with the name of the weekday for each date.
 
@@ -203,13 +303,19 @@ class IteratorDateUtils:
             data (Iterable): Input data containing dates (list, tuple, Series, or DataFrame).
             date_col (str): Name of the column containing the dates.
             new_col_name (str): Name for the new column to be added.
+            categorical (bool): Return an ordered categorical with the seven weekday names as
+                categories (one byte per row) instead of a string per row.
 
         Returns:
             pd.DataFrame: DataFrame with the weekday name column.
         """
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, date_col)
-        df[new_col_name] = pd.to_datetime(df[date_col]).dt.day_name()
+        dates = IteratorDateUtils._validate_date_column(df, date_col)
+        if categorical:
+            codes = dates.dt.dayofweek.fillna(-1).to_numpy(dtype=np.int8)
+            df[new_col_name] = pd.Categorical.from_codes(codes, categories=IteratorDateUtils._WEEKDAYS, ordered=True)
+        else:
+            df[new_col_name] = dates.dt.day_name()
         return df
 
     @staticmethod
@@ -227,7 +333,120 @@ class IteratorDateUtils:
             pd.DataFrame: DataFrame with the total days difference column.
         """
         df = IteratorDateUtils._validate_iterable(data)
-        IteratorDateUtils._validate_date_column(df, start_date_col)
-        IteratorDateUtils._validate_date_column(df, end_date_col)
-        df[new_col_name] = (pd.to_datetime(df[end_date_col]) - pd.to_datetime(df[start_date_col])).dt.days
-        return df
\ No newline at end of file
+        start_dates = IteratorDateUtils._validate_date_column(df, start_date_col)
+        end_dates = IteratorDateUtils._validate_date_column(df, end_date_col)
+        df[new_col_name] = (end_dates - start_dates).dt.days
+        return df
+
+    @staticmethod
+    def fiscal_periods(data, date_col, fiscal_calendar=None, fields=None, prefix="fiscal_"):
+        """
+        Adds fiscal year, quarter, period and week columns for each date, e.g. to group on with
+        StreamAggregations (with native_keys=True to keep the keys as integers).
+
+        Args:
+            data (Iterable): Input data containing dates (list, tuple, Series, or DataFrame).
+            date_col (str): Name of the column containing the dates.
+            fiscal_calendar (FiscalCalendar, optional): Fiscal calendar; the calendar year otherwise.
+            fields (list, optional): Fields to add among 'year', 'quarter', 'period' and 'week' (all by default).
+            prefix (str): Prefix of the new column names (e.g. 'fiscal_year').
+
+        Returns:
+            pd.DataFrame: DataFrame with one column per fiscal field, integers (or floats with NaN for
+            missing dates).
+        """
+        df = IteratorDateUtils._validate_iterable(data)
+        dates = IteratorDateUtils._validate_date_column(df, date_col)
+        if fiscal_calendar is None:
+            fiscal_calendar = FiscalCalendar()
+        elif not isinstance(fiscal_calendar, FiscalCalendar):
+            raise ValueError("Fiscal calendar must be a FiscalCalendar.")
+        fields = list(FiscalCalendar.FIELDS if fields is None else fields)
+        unknown = [field for field in fields if field not in FiscalCalendar.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fiscal fields: {', '.join(map(str, unknown))}. "
+                             f"Supported fields are: {', '.join(FiscalCalendar.FIELDS)}.")
+
+        values = fiscal_calendar.lookup(dates)
+        for field in fields:
+            df[prefix + field] = values[:, FiscalCalendar.FIELDS.index(field)]
+        return df
+
+    @staticmethod
+    def iter_enrich(chunks, enrichments):
+        """
+        Applies a set of date enrichments to a stream of chunks and yields each enriched chunk, so files
+        larger than memory are processed one chunk at a time (e.g. pd.read_csv(path, chunksize=...) or
+        the row groups of a Parquet file read one by one).
+
+        business_days_between_rows carries the last date of each chunk into the next, so its values
+        are the same as on the whole file; the other enrichments only look at their own row. Only the
+        current chunk and one date per row enrichment are kept in memory. The date columns of each
+        chunk are parsed once for all the enrichments, and the format inferred for a string column is
+        kept for the following chunks of this stream.
+
+        Args:
+            chunks (Iterable): DataFrames (or lists, tuples or Series of dates, read as a 'date' column).
+            enrichments (list of dict): One dict per enrichment, with 'enrichment' set to
+                'business_days_between_rows', 'next_working_day', 'business_days' (between two
+                columns), 'add_business_days', 'subtract_business_days', 'is_business_day',
+                'weekday_name', 'days_difference' or 'fiscal_periods', and the other keys passed to the
+                matching method (e.g. date_column, start_date_col, end_date_col, num_days, new_col_name,
+                calendar).
+
+        Yields:
+            pd.DataFrame: Each chunk with the enrichment columns added.
+        """
+        methods = {
+            'business_days_between_rows': None,
+            'next_working_day': IteratorDateUtils.iter_next_working_day,
+            'business_days': IteratorDateUtils.iter_business_days,
+            'add_business_days': IteratorDateUtils.add_business_days,
+            'subtract_business_days': IteratorDateUtils.subtract_business_days,
+            'is_business_day': IteratorDateUtils.is_business_day,
+            'weekday_name': IteratorDateUtils.weekday_name,
+            'days_difference': IteratorDateUtils.days_difference,
+            'fiscal_periods': IteratorDateUtils.fiscal_periods
+        }
+        steps = []
+        for spec in enrichments:
+            options = dict(spec)
+            enrichment = options.pop('enrichment', None)
+            if enrichment not in methods:
+                raise ValueError(f"Unknown enrichment '{enrichment}'. "
+                                 f"Supported enrichments are: {', '.join(methods)}.")
+            if enrichment == 'business_days_between_rows':
+                options.setdefault('date_column', 'delivery_start_date')
+                options.setdefault('new_col_name', 'business_days_to_previous')
+                IteratorDateUtils._validate_calendar(options.get('calendar'))
+            steps.append((enrichment, options))
+        date_columns = list(dict.fromkeys(options[key] for _, options in steps
+                                          for key in ('date_column', 'date_col', 'start_date_col', 'end_date_col')
+                                          if key in options))
+
+        # Last date seen by each business_days_between_rows step, and the formats inferred in this stream
+        previous = [pd.NaT] * len(steps)
+        formats = {}
+        for chunk in chunks:
+            chunk = IteratorDateUtils._validate_iterable(chunk)
+            # The enrichments run on a shallow copy holding the parsed dates, the original columns are put back
+            df = chunk.copy(deep=False)
+            for column in date_columns:
+                df[column] = IteratorDateUtils._validate_date_column(chunk, column, formats)
+            for position, (enrichment, options) in enumerate(steps):
+                if enrichment != 'business_days_between_rows':
+                    df = methods[enrichment](df, **options)
+                    continue
+                dates = IteratorDateUtils._validate_date_column(df, options['date_column'])
+                if len(dates) == 0:
+                    df[options['new_col_name']] = np.empty(0, dtype=float)
+                    continue
+                shifted = dates.shift(1)
+                shifted.iloc[0] = previous[position]
+                counts = IteratorDateUtils._business_day_counts(shifted, dates, options.get('calendar'))
+                # Float in every chunk, as on the whole file where the first row is NaN
+                df[options['new_col_name']] = counts.astype(float)
+                previous[position] = dates.iloc[-1]
+            for column in date_columns:
+                df[column] = chunk[column]
+            yield df
@@ -1,4 +1,10 @@
+import bisect
+import heapq
+import math
 import numpy as np
+import pandas as pd
+from array import array
+from collections import deque
 from collections.abc import Iterable
 
 class LazyRollingWindow:
@@ -27,6 +33,13 @@ class LazyRollingWindow:
         self.window_start = 0
         self.window_end = window_size
 
+        # Incremental statistics of the current window, updated in O(1) amortized per step
+        self._state = _WindowState()
+        for position, value in enumerate(self._get_window_data()):
+            self._state.add(position, value)
+        # Sorted copy of the window for the rolling quantiles, built on the first detect_outliers() call
+        self._sorted = None
+
     def _get_window_data(self):
         """Returns the data in the current window."""
         return self.data[self.window_start:self.window_end]
@@ -34,48 +47,97 @@ class LazyRollingWindow:
     def _update_window(self):
         """Moves the window by one step."""
         if self.window_end < len(self.data):
+            self._state.add(self.window_end, self.data[self.window_end])
+            self._state.remove(self.window_start, self.data[self.window_start])
+            if self._sorted is not None:
+                self._sorted.add(self.data[self.window_end])
+                self._sorted.remove(self.data[self.window_start])
             self.window_start += 1
             self.window_end += 1
+            # Recompute the running sums once per full window to bound floating-point drift
+            if self.window_start % self.window_size == 0 or self._state.needs_resync():
+                self._state.resync(self._get_window_data())
 
     def get_window_sum(self):
         """Returns the sum of the values in the current window."""
-        return sum(self._get_window_data())
+        if not self._state.exact():
+            return sum(self._get_window_data())
+        return self._state.sum
 
     def get_window_avg(self):
         """Returns the average of the values in the current window."""
-        window_data = self._get_window_data()
-        return sum(window_data) / len(window_data) if len(window_data) > 0 else 0
+        if not self._state.exact():
+            return self.get_window_sum() / self._state.count
+        return self._state.sum / self._state.count if self._state.count > 0 else 0
 
     def get_window_std_dev(self):
         """Returns the standard deviation of the values in the current window."""
-        window_data = self._get_window_data()
-        if len(window_data) < 2:
-            return 0.0
-        return np.std(window_data)
+        if not self._state.exact() and self._state.count >= 2:
+            return np.std(self._get_window_data())
+        return self._state.std_dev()
 
     def get_max_of_window(self):
         """Returns the maximum value in the current window."""
-        return max(self._get_window_data())
+        if self._state.non_finite:
+            return max(self._get_window_data())
+        return self._state.max()
 
     def get_min_of_window(self):
         """Returns the minimum value in the current window."""
-        return min(self._get_window_data())
+        if self._state.non_finite:
+            return min(self._get_window_data())
+        return self._state.min()
 
     def filter_window(self, condition):
         """Applies a filter on the window (e.g., a condition such as values greater than a threshold)."""
         window_data = self._get_window_data()
         return [x for x in window_data if condition(x)]
 
+    def _get_sorted_window(self):
+        """Returns the sorted copy of the current window, building it on first use."""
+        if self._sorted is None:
+            self._sorted = _SortedWindow(self._get_window_data())
+        return self._sorted
+
     def detect_outliers(self):
-        """Detects outliers in the current window using the IQR method."""
-        window_data = self._get_window_data()
-        if len(window_data) < 4:
+        """
+        Detects outliers in the current window using the IQR method.
+
+        Q1 and Q3 are read from a sorted copy of the window that is updated as the window slides, so
+        each step costs O(log w) comparisons instead of a full sort, and the window is only scanned
+        when its smallest or largest value falls outside the fences.
+        """
+        sorted_window = self._get_sorted_window()
+        if len(sorted_window.values) + sorted_window.non_finite < 4:
             return []
-        q1, q3 = np.percentile(window_data, [25, 75])
+        if sorted_window.non_finite:
+            # NaN and inf cannot be kept in sorted order, use np.percentile on the window instead
+            window_data = self._get_window_data()
+            q1, q3 = np.percentile(window_data, [25, 75])
+            iqr = q3 - q1
+            lower_bound = q1 - 1.5 * iqr
+            upper_bound = q3 + 1.5 * iqr
+            return [x for x in window_data if x < lower_bound or x > upper_bound]
+        q1 = sorted_window.quantile(0.25)
+        q3 = sorted_window.quantile(0.75)
         iqr = q3 - q1
         lower_bound = q1 - 1.5 * iqr
         upper_bound = q3 + 1.5 * iqr
-        return [x for x in window_data if x < lower_bound or x > upper_bound]
+        if sorted_window.values[0] >= lower_bound and sorted_window.values[-1] <= upper_bound:
+            return []
+        return [x for x in self._get_window_data() if x < lower_bound or x > upper_bound]
+
+    def iter_outliers(self):
+        """
+        Yields detect_outliers() for the current window and for every following window position, moving
+        the window as it goes (for StreamingRollingWindow, until the source is exhausted).
+        """
+        while True:
+            yield self.detect_outliers()
+            window_end = self.window_end
+            self.next_window()
+            if self.window_end == window_end:
+                return
 
     def detect_seasonality(self):
         """Detects simple seasonality patterns using rolling mean over a window."""
@@ -93,3 +155,618 @@ class LazyRollingWindow:
             self._update_window()
         else:
             return None
+
+    def compute_all_windows(self, block_bytes=2 ** 26):
+        """
+        Computes the statistics of every window position of the series at once with NumPy, instead of
+        looping over next_window() and the getters.
+
+        Windows are read through a sliding_window_view (no copy) and reduced in blocks of as many windows
+        as fit in `block_bytes` (64 MB by default, at least one window), which bounds the size of each
+        temporary whatever the window size.
+
+        Returns:
+            dict: Arrays indexed by window position: 'sum', 'avg', 'std_dev', 'max', 'min',
+            'seasonality' (NaN where detect_seasonality returns None), the IQR fences 'lower_bound' and
+            'upper_bound' of detect_outliers (NaN for windows shorter than 4 values) and
+            'outlier_count', the number of values detect_outliers returns. The outliers of window i
+            are the values of data[i:i + window_size] outside its fences.
+        """
+        values = np.asarray(self.data, dtype=float)
+        length = min(self.window_size, len(values))
+        windows = np.lib.stride_tricks.sliding_window_view(values, length)
+        n_windows = len(windows)
+        result = {
+            'sum': np.empty(n_windows),
+            'avg': np.empty(n_windows),
+            'std_dev': np.zeros(n_windows),
+            'max': windows.max(axis=1),
+            'min': windows.min(axis=1),
+            'seasonality': np.full(n_windows, np.nan),
+            'lower_bound': np.full(n_windows, np.nan),
+            'upper_bound': np.full(n_windows, np.nan),
+            'outlier_count': np.zeros(n_windows, dtype=np.int64)
+        }
+        block_size = max(1, block_bytes // (8 * length))
+        for start in range(0, n_windows, block_size):
+            block = windows[start:start + block_size]
+            rows = slice(start, start + len(block))
+            result['sum'][rows] = block.sum(axis=1)
+            mean = block.mean(axis=1)
+            result['avg'][rows] = result['sum'][rows] / length
+            if length >= 2:
+                result['std_dev'][rows] = block.std(axis=1)
+            if length >= 3:
+                result['seasonality'][rows] = np.abs(block - mean[:, None]).mean(axis=1) / mean
+            if length >= 4:
+                q1, q3 = np.percentile(block, [25, 75], axis=1)
+                iqr = q3 - q1
+                lower_bound = q1 - 1.5 * iqr
+                upper_bound = q3 + 1.5 * iqr
+                result['lower_bound'][rows] = lower_bound
+                result['upper_bound'][rows] = upper_bound
+                outside = (block < lower_bound[:, None]) | (block > upper_bound[:, None])
+                result['outlier_count'][rows] = outside.sum(axis=1)
+        return result
+
+
+class StreamingRollingWindow(LazyRollingWindow):
+    """
+    Rolling window fed by any iterable or iterator (e.g. a generator, a message consumer or a CSV row
+    reader). Only the last `window_size` values are kept, in an array('d') ring buffer, so memory is
+    O(window_size) whatever the length of the stream. Supports the same getters as LazyRollingWindow.
+    """
+
+    def __init__(self, data, window_size):
+        # Check if data is iterable
+        if not isinstance(data, Iterable):
+            raise TypeError("Data should be an iterable.")
+
+        # Check window_size validity
+        if not isinstance(window_size, int) or window_size <= 0:
+            raise ValueError("Window size must be a positive integer.")
+
+        self.window_size = window_size
+        self.window_start = 0
+        self.window_end = 0
+        self._source = iter(data)
+        self._buffer = array('d', bytes(8 * window_size))
+        self._head = 0  # index of the oldest value in the buffer
+        self._count = 0
+        self._state = _WindowState()
+        self._sorted = None
+
+        # Fill the first window
+        while self._count < window_size and self._pull() is not None:
+            pass
+        # Check if data is empty
+        if self._count == 0:
+            raise ValueError("Data cannot be empty.")
+
+    def _pull(self):
+        """Reads the next value from the source into the window. Returns None once the source is exhausted."""
+        try:
+            item = next(self._source)
+        except StopIteration:
+            return None
+        self.push(item)
+        return item
+
+    def push(self, item):
+        """Adds a value to the window, evicting the oldest one once the window is full."""
+        try:
+            value = float(item)
+        except (ValueError, TypeError):
+            raise ValueError(f"Non-numeric value found: {item}. Data should contain only numeric values.")
+        if self._count == self.window_size:
+            self._state.remove(self.window_start, self._buffer[self._head])
+            if self._sorted is not None:
+                self._sorted.remove(self._buffer[self._head])
+            self._buffer[self._head] = value
+            self._head = (self._head + 1) % self.window_size
+            self.window_start += 1
+        else:
+            self._buffer[(self._head + self._count) % self.window_size] = value
+            self._count += 1
+        self._state.add(self.window_end, value)
+        if self._sorted is not None:
+            self._sorted.add(value)
+        self.window_end += 1
+        # Recompute the running sums once per full window to bound floating-point drift
+        if self.window_start > 0 and (self.window_start % self.window_size == 0 or self._state.needs_resync()):
+            self._state.resync(self._get_window_data())
+
+    def _get_window_data(self):
+        """Returns the data in the current window, oldest first."""
+        end = self._head + self._count
+        if end <= self.window_size:
+            return self._buffer[self._head:end]
+        return self._buffer[self._head:] + self._buffer[:end - self.window_size]
+
+    def next_window(self):
+        """Moves the window to the next step by reading one more value from the source."""
+        if self._pull() is None:
+            return None
+
+    def compute_all_windows(self, block_bytes=2 ** 26):
+        """Not available on a stream: only the current window is kept. Use iter_windows() instead."""
+        raise TypeError("compute_all_windows needs the whole series; a StreamingRollingWindow only keeps "
+                        "its current window, use iter_windows() instead.")
+
+    def iter_windows(self):
+        """
+        Yields the statistics of the current window and of every following window until the source is
+        exhausted, as dictionaries with 'sum', 'avg', 'std_dev', 'max' and 'min'.
+        """
+        while True:
+            yield {
+                'sum': self.get_window_sum(),
+                'avg': self.get_window_avg(),
+                'std_dev': self.get_window_std_dev(),
+                'max': self.get_max_of_window(),
+                'min': self.get_min_of_window()
+            }
+            if self._pull() is None:
+                return
+
+
+class TimeRollingWindow:
+    """
+    Event-time rolling window fed with (timestamp, value) events, e.g. ORDERDATE and SALES rows.
+
+    The window covers either a time span (`window`, anything pd.Timedelta accepts, e.g. '30D'), holding
+    the events in (t - window, t], or the last `business_days` business days up to the date of t, where
+    t is the latest event released into the window. Events are evicted by time as t moves forward and
+    the statistics are updated incrementally.
+
+    Events may arrive out of order by up to `allowed_lateness`: they wait in a reorder buffer until the
+    latest timestamp seen is `allowed_lateness` past them, so the buffer only holds that span. Events
+    older than the window end once released are dropped and counted in `late_events`.
+    """
+
+    def __init__(self, window=None, business_days=None, allowed_lateness=None):
+        if (window is None) == (business_days is None):
+            raise ValueError("Exactly one of window or business_days must be given.")
+        if window is not None:
+            try:
+                window = pd.Timedelta(window)
+            except (ValueError, TypeError):
+                raise ValueError(f"Invalid window: {window}.")
+            if window <= pd.Timedelta(0):
+                raise ValueError("Window must be a positive duration.")
+            self._span = window.value
+        elif not isinstance(business_days, int) or business_days <= 0:
+            raise ValueError("Business days must be a positive integer.")
+        try:
+            lateness = pd.Timedelta(allowed_lateness or 0)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid allowed lateness: {allowed_lateness}.")
+        if lateness < pd.Timedelta(0):
+            raise ValueError("Allowed lateness cannot be negative.")
+
+        self.window = window
+        self.business_days = business_days
+        self.allowed_lateness = lateness
+        self.window_end = None  # timestamp of the latest event released into the window
+        self.late_events = 0
+        self._lateness = lateness.value
+        self._max_seen = None  # latest timestamp pushed, in ns
+        self._pending = []  # reorder buffer: heap of (ns, sequence, timestamp, value)
+        self._sequence = 0
+        self._window = deque()  # (ns, position, value) of the window, oldest first
+        self._added = 0  # number of events released so far, used as positions by _WindowState
+        self._evicted = 0  # evictions since the last resync
+        self._cutoff_day = None  # (date, cutoff in ns) cache of the business-day cutoff
+        self._state = _WindowState()
+
+    def _enqueue(self, timestamp, item):
+        """Validates an event and puts it in the reorder buffer."""
+        try:
+            timestamp = pd.Timestamp(timestamp)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid timestamp: {timestamp}.")
+        if timestamp is pd.NaT:
+            raise ValueError("Timestamp cannot be null.")
+        try:
+            value = float(item)
+        except (ValueError, TypeError):
+            raise ValueError(f"Non-numeric value found: {item}. Data should contain only numeric values.")
+        ns = timestamp.value
+        if self.window_end is not None and ns < self.window_end.value:
+            self.late_events += 1
+            return
+        heapq.heappush(self._pending, (ns, self._sequence, timestamp, value))
+        self._sequence += 1
+        if self._max_seen is None or ns > self._max_seen:
+            self._max_seen = ns
+
+    def _ready(self):
+        """Returns True when the oldest buffered event is past the allowed lateness."""
+        return bool(self._pending) and self._pending[0][0] <= self._max_seen - self._lateness
+
+    def _cutoff(self, timestamp):
+        """Returns the oldest timestamp (in ns) still in the window when it ends at `timestamp`."""
+        if self.business_days is None:
+            return timestamp.value - self._span + 1
+        day = timestamp.date()
+        if self._cutoff_day is None or self._cutoff_day[0] != day:
+            first_day = np.busday_offset(np.datetime64(day), -(self.business_days - 1), roll='backward')
+            self._cutoff_day = (day, pd.Timestamp(first_day).tz_localize(timestamp.tz).value)
+        return self._cutoff_day[1]
+
+    def _release_next(self):
+        """Moves the oldest buffered event into the window and evicts the events that fell out of it."""
+        ns, _, timestamp, value = heapq.heappop(self._pending)
+        self._window.append((ns, self._added, value))
+        self._state.add(self._added, value)
+        self._added += 1
+        self.window_end = timestamp
+        cutoff = self._cutoff(timestamp)
+        while self._window[0][0] < cutoff:
+            _, position, evicted = self._window.popleft()
+            self._state.remove(position, evicted)
+            self._evicted += 1
+        # Recompute the running sums once per window length of evictions to bound floating-point drift
+        if self._evicted and (self._evicted >= len(self._window) or self._state.needs_resync()):
+            self._state.resync(self._get_window_data())
+            self._evicted = 0
+
+    def push(self, timestamp, item):
+        """Adds an event, releasing the buffered events that can no longer be preceded by a late one."""
+        self._enqueue(timestamp, item)
+        while self._ready():
+            self._release_next()
+
+    def update(self, events):
+        """Adds every (timestamp, value) pair of an iterable of events, in arrival order."""
+        if not isinstance(events, Iterable):
+            raise TypeError("Events should be an iterable of (timestamp, value) pairs.")
+        for timestamp, value in events:
+            self.push(timestamp, value)
+
+    def flush(self):
+        """Releases every buffered event into the window (e.g. at the end of the stream)."""
+        while self._pending:
+            self._release_next()
+
+    def _get_window_data(self):
+        """Returns the data in the current window, oldest first."""
+        return [value for _, _, value in self._window]
+
+    def get_window_count(self):
+        """Returns the number of events in the current window."""
+        return self._state.count
+
+    def get_window_sum(self):
+        """Returns the sum of the values in the current window."""
+        if not self._state.exact():
+            return sum(self._get_window_data())
+        return self._state.sum
+
+    def get_window_avg(self):
+        """Returns the average of the values in the current window."""
+        if not self._state.exact():
+            return self.get_window_sum() / self._state.count
+        return self._state.sum / self._state.count if self._state.count > 0 else 0
+
+    def get_window_std_dev(self):
+        """Returns the standard deviation of the values in the current window."""
+        if not self._state.exact() and self._state.count >= 2:
+            return np.std(self._get_window_data())
+        return self._state.std_dev()
+
+    def get_max_of_window(self):
+        """Returns the maximum value in the current window (None while it is empty)."""
+        if self._state.non_finite:
+            return max(self._get_window_data())
+        return self._state.max() if self._state.count > 0 else None
+
+    def get_min_of_window(self):
+        """Returns the minimum value in the current window (None while it is empty)."""
+        if self._state.non_finite:
+            return min(self._get_window_data())
+        return self._state.min() if self._state.count > 0 else None
+
+    def iter_windows(self, events):
+        """
+        Feeds an iterable of (timestamp, value) events and yields the statistics of the window each time
+        an event is released into it, in event-time order, flushing the reorder buffer at the end.
+        Dictionaries have 'timestamp' (the window end), 'count', 'sum', 'avg', 'std_dev', 'max' and 'min'.
+        """
+        if not isinstance(events, Iterable):
+            raise TypeError("Events should be an iterable of (timestamp, value) pairs.")
+        for timestamp, value in events:
+            self._enqueue(timestamp, value)
+            while self._ready():
+                self._release_next()
+                yield self._window_stats()
+        while self._pending:
+            self._release_next()
+            yield self._window_stats()
+
+    def _window_stats(self):
+        return {
+            'timestamp': self.window_end,
+            'count': self.get_window_count(),
+            'sum': self.get_window_sum(),
+            'avg': self.get_window_avg(),
+            'std_dev': self.get_window_std_dev(),
+            'max': self.get_max_of_window(),
+            'min': self.get_min_of_window()
+        }
+
+
+class KeyedRollingWindow:
+    """
+    Rolling windows of many series at once, one per key (e.g. a product code or a customer), fed with
+    (key, value) events.
+
+    Every key gets a slot in one contiguous (capacity, window_size) float64 array used as a ring buffer
+    per row, plus a head position and a count, so memory is about 8 * window_size bytes per key with no
+    per-object overhead. The capacity doubles when the slots are used up.
+    """
+
+    def __init__(self, window_size, capacity=1024):
+        # Check window_size validity
+        if not isinstance(window_size, int) or window_size <= 0:
+            raise ValueError("Window size must be a positive integer.")
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("Capacity must be a positive integer.")
+
+        self.window_size = window_size
+        self._slots = {}  # key -> row of the store
+        self._keys = []  # row -> key
+        self._values = np.zeros((capacity, window_size))
+        self._head = np.zeros(capacity, dtype=np.int64)  # column of the oldest value of each row
+        self._count = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def keys(self):
+        """Returns the keys seen so far, in order of first appearance."""
+        return list(self._keys)
+
+    def _grow(self):
+        """Doubles the number of slots of the store."""
+        capacity = 2 * len(self._values)
+        self._values = np.concatenate([self._values, np.zeros_like(self._values)])
+        self._head = np.resize(self._head, capacity)
+        self._head[len(self._keys):] = 0
+        self._count = np.resize(self._count, capacity)
+        self._count[len(self._keys):] = 0
+
+    def push(self, key, item):
+        """Adds a value to the window of `key`, evicting its oldest value once the window is full."""
+        try:
+            value = float(item)
+        except (ValueError, TypeError):
+            raise ValueError(f"Non-numeric value found: {item}. Data should contain only numeric values.")
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            if slot == len(self._values):
+                self._grow()
+            self._slots[key] = slot
+            self._keys.append(key)
+        count = self._count[slot]
+        if count == self.window_size:
+            head = self._head[slot]
+            self._values[slot, head] = value
+            self._head[slot] = (head + 1) % self.window_size
+        else:
+            self._values[slot, (self._head[slot] + count) % self.window_size] = value
+            self._count[slot] = count + 1
+
+    def update(self, events):
+        """Adds every (key, value) pair of an iterable of events, in order."""
+        if not isinstance(events, Iterable):
+            raise TypeError("Events should be an iterable of (key, value) pairs.")
+        for key, value in events:
+            self.push(key, value)
+
+    def _row(self, key):
+        """Returns the values of the window of `key`, in storage order."""
+        if key not in self._slots:
+            raise KeyError(f"Unknown key: {key}")
+        slot = self._slots[key]
+        return self._values[slot, :self._count[slot]]
+
+    def get_window_data(self, key):
+        """Returns the values in the window of `key`, oldest first."""
+        row = self._row(key)
+        return np.roll(row, -self._head[self._slots[key]]).tolist()
+
+    def get_window_sum(self, key):
+        """Returns the sum of the values in the window of `key`."""
+        return self._row(key).sum().item()
+
+    def get_window_avg(self, key):
+        """Returns the average of the values in the window of `key`."""
+        return self._row(key).mean().item()
+
+    def get_window_std_dev(self, key):
+        """Returns the standard deviation of the values in the window of `key`."""
+        return self._row(key).std().item()
+
+    def get_max_of_window(self, key):
+        """Returns the maximum value in the window of `key`."""
+        return self._row(key).max().item()
+
+    def get_min_of_window(self, key):
+        """Returns the minimum value in the window of `key`."""
+        return self._row(key).min().item()
+
+    def compute_all_keys(self, block_size=65536):
+        """
+        Computes the statistics of the window of every key at once with NumPy, in blocks of `block_size`
+        keys to bound the size of the temporaries.
+
+        Returns:
+            dict: 'keys' (list, in order of first appearance) and arrays aligned with it: 'count',
+            'sum', 'avg', 'std_dev', 'max' and 'min'.
+        """
+        n_keys = len(self._keys)
+        result = {
+            'keys': list(self._keys),
+            'count': self._count[:n_keys].copy(),
+            'sum': np.empty(n_keys),
+            'avg': np.empty(n_keys),
+            'std_dev': np.empty(n_keys),
+            'max': np.empty(n_keys),
+            'min': np.empty(n_keys)
+        }
+        for start in range(0, n_keys, block_size):
+            rows = slice(start, min(start + block_size, n_keys))
+            values = self._values[rows]
+            count = result['count'][rows]
+            # Rows of keys with fewer than window_size values are only filled up to their count
+            filled = np.arange(self.window_size) < count[:, None]
+            result['sum'][rows] = np.where(filled, values, 0.0).sum(axis=1)
+            mean = result['sum'][rows] / count
+            result['avg'][rows] = mean
+            deviations = np.where(filled, values - mean[:, None], 0.0)
+            result['std_dev'][rows] = np.sqrt((deviations ** 2).sum(axis=1) / count)
+            result['max'][rows] = np.where(filled, values, -np.inf).max(axis=1)
+            result['min'][rows] = np.where(filled, values, np.inf).min(axis=1)
+        return result
+
+
+class _WindowState:
+    """
+    Incremental statistics of a sliding window.
+
+    Keeps a running sum, a Welford mean and sum of squared deviations (with add and remove updates)
+    and two monotonic deques of (position, value) for the maximum and minimum, so sliding the window
+    by one value costs O(1) amortized whatever the window size. Values must be removed in the order
+    they were added.
+
+    Non-finite values (NaN, inf) are only counted: they are kept out of the running sums and the
+    deques, and the windows compute their statistics from the window values while any is present
+    (see exact()).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.non_finite = 0
+        self.sum = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._m2_peak = 0.0  # largest m2 since the last resync
+        self._max = deque()  # decreasing values
+        self._min = deque()  # increasing values
+
+    def add(self, position, value):
+        """Adds the value at `position` (positions must increase)."""
+        self.count += 1
+        if not math.isfinite(value):
+            self.non_finite += 1
+            return
+        self.sum += value
+        delta = value - self.mean
+        self.mean += delta / (self.count - self.non_finite)
+        self.m2 += delta * (value - self.mean)
+        self._m2_peak = max(self._m2_peak, self.m2)
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((position, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((position, value))
+
+    def remove(self, position, value):
+        """Removes the oldest value, which was added at `position`."""
+        self.count -= 1
+        if not math.isfinite(value):
+            self.non_finite -= 1
+            return
+        self.sum -= value
+        if self.count == self.non_finite:
+            self.sum = self.mean = self.m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean -= delta / (self.count - self.non_finite)
+            self.m2 -= delta * (value - self.mean)
+        if self._max and self._max[0][0] == position:
+            self._max.popleft()
+        if self._min and self._min[0][0] == position:
+            self._min.popleft()
+
+    def resync(self, values):
+        """Recomputes the sum, mean and squared deviations exactly from the (finite) window values."""
+        values = [x for x in values if math.isfinite(x)]
+        self.sum = sum(values)
+        self.mean = self.sum / len(values) if values else 0.0
+        # Multiplying gives inf on overflow where ** raises
+        self.m2 = sum((x - self.mean) * (x - self.mean) for x in values)
+        self._m2_peak = self.m2
+
+    def needs_resync(self):
+        """
+        Returns True when the squared deviations dropped by many orders of magnitude since the last
+        resync (e.g. a large value left the window), where removing values loses most significant digits,
+        or when the running sums overflowed.
+        """
+        if not (math.isfinite(self.sum) and math.isfinite(self.m2)):
+            return True
+        return self.m2 < self._m2_peak * 1e-6
+
+    def exact(self):
+        """Returns False while the running statistics cannot be used (non-finite values or an overflow)."""
+        return self.non_finite == 0 and math.isfinite(self.sum) and math.isfinite(self.m2)
+
+    def std_dev(self):
+        """Returns the population standard deviation of the finite values (0.0 for fewer than two)."""
+        count = self.count - self.non_finite
+        if count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2 / count, 0.0))
+
+    def max(self):
+        """Returns the maximum value."""
+        return self._max[0][1]
+
+    def min(self):
+        """Returns the minimum value."""
+        return self._min[0][1]
+
+
+class _SortedWindow:
+    """
+    Values of a sliding window kept in sorted order. Inserting and removing a value use a binary search
+    (plus a block move of the list), so rolling quantiles are read without sorting the window again.
+    """
+
+    def __init__(self, values):
+        # NaN cannot be ordered, non-finite values are only counted
+        self.values = sorted(x for x in values if math.isfinite(x))
+        self.non_finite = len(values) - len(self.values)
+
+    def add(self, value):
+        if math.isfinite(value):
+            bisect.insort(self.values, value)
+        else:
+            self.non_finite += 1
+
+    def remove(self, value):
+        if math.isfinite(value):
+            del self.values[bisect.bisect_left(self.values, value)]
+        else:
+            self.non_finite -= 1
+
+    def quantile(self, q):
+        """Returns the q-th quantile (0 <= q <= 1) with the same linear interpolation as np.percentile."""
+        n = len(self.values)
+        # Same virtual index and interpolation formulas as NumPy, so the results match to the last bit
+        index = (n - 1) * q
+        lower = math.floor(index)
+        gamma = index - lower
+        below = self.values[lower]
+        above = self.values[min(lower + 1, n - 1)]
+        diff = above - below
+        if gamma >= 0.5:
+            return above - diff * (1 - gamma)
+        return below + diff * gamma
@@ -1,10 +1,30 @@
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
 
 class StreamAggregations:
+    # Metrics supported by stream_group_agg, mapped to the groupby aggregation computing them
+    # (mad has no built-in groupby kernel and is computed by _group_mad)
+    _AGG_FUNCS = {
+        'count': 'size', 'first': 'first', 'last': 'last', 'mean': 'mean', 'median': 'median',
+        'min': 'min', 'max': 'max', 'std': 'var', 'var': 'var', 'mad': None, 'prod': 'prod', 'sum': 'sum'
+    }
+    # Metrics that can be rebuilt from mergeable per-group partial state (median uses a per-group
+    # quantile sketch or a spill to disk, see stream_group_agg_chunks)
+    _CHUNK_METRICS = ('count', 'first', 'last', 'mean', 'median', 'min', 'max', 'std', 'var', 'prod', 'sum')
+
     @staticmethod
-    def _validate_inputs(df, group_columns, value_column):
+    def _validate_inputs(df, group_columns, value_column, native_keys=False):
         """
-        Validates the input data and columns.
+        Validates the input data and columns and returns the frame to group on.
+
+        By default non-string group columns are cast to strings on a shallow copy, so the caller's
+        frame is never modified. With native_keys=True the keys are grouped as they are (numeric,
+        categorical, ...) without any cast or copy.
         """
         # Convert dictionary to DataFrame
         if isinstance(df, dict):
@@ -19,16 +39,22 @@ class StreamAggregations:
         
         # Check if DataFrame is empty
         if df.empty:
-            return df.empty  # DataFrame is empty
+            return df
         
-        # Convert grouping columns to string type if needed
-        for col in group_columns:
-            if not pd.api.types.is_string_dtype(df[col]) and not pd.api.types.is_object_dtype(df[col]):
-                df[col] = df[col].astype(str)
-
         # Ensure group_columns is a list
         if isinstance(group_columns, str):
             group_columns = [group_columns]
+
+        # Convert grouping columns to string type if needed
+        if not native_keys:
+            string_df = None
+            for col in group_columns:
+                if not pd.api.types.is_string_dtype(df[col]) and not pd.api.types.is_object_dtype(df[col]):
+                    if string_df is None:
+                        string_df = df.copy(deep=False)
+                    string_df[col] = df[col].astype(str)
+            if string_df is not None:
+                df = string_df
         
         # Check if all group_columns and value_column exist in DataFrame
         missing_cols = [col for col in group_columns if col not in df.columns]
@@ -38,8 +64,19 @@ class StreamAggregations:
             raise ValueError(f"Column '{value_column}' not found in Data.")
         if not pd.api.types.is_numeric_dtype(df[value_column]):
             raise ValueError(f"The value column '{value_column}' must contain numeric data.")
-        
+        return df
 
+    @staticmethod
+    def _format_keys(result_df, group_columns, native_keys):
+        """
+        Converts the group labels of a result to strings when the keys were grouped natively.
+        """
+        if native_keys and not result_df.empty:
+            if isinstance(group_columns, str):
+                group_columns = [group_columns]
+            for col in group_columns:
+                result_df[col] = result_df[col].astype(str)
+        return result_df
 
     @staticmethod
     def _format_output(result, output_type):
@@ -55,103 +92,542 @@ class StreamAggregations:
         return result
 
     @staticmethod
-    def stream_group_count(df, group_columns, value_column, output_type='float'):
+    def stream_group_count(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the total number of items in each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).size().reset_index(name="count")
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        result_df = df.groupby(group_columns, observed=True).size().reset_index(name="count")
         result_df["count"] = StreamAggregations._format_output(result_df["count"], output_type)
-        return result_df
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
 
     @staticmethod
-    def stream_group_first_last(df, group_columns, value_column, output_type='float'):
+    def stream_group_first_last(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the first and last item for each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).agg(
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        result_df = df.groupby(group_columns, observed=True).agg(
             first=(value_column, 'first'),
             last=(value_column, 'last')
         ).reset_index()
         result_df["first"] = StreamAggregations._format_output(result_df["first"], output_type)
         result_df["last"] = StreamAggregations._format_output(result_df["last"], output_type)
-        return result_df
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
 
     @staticmethod
-    def stream_group_mean_median(df, group_columns, value_column, output_type='float'):
+    def stream_group_mean_median(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the mean and median for each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).agg(
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        result_df = df.groupby(group_columns, observed=True).agg(
             mean=(value_column, 'mean'),
             median=(value_column, 'median')
         ).reset_index()
         result_df["mean"] = StreamAggregations._format_output(result_df["mean"], output_type)
         result_df["median"] = StreamAggregations._format_output(result_df["median"], output_type)
-        return result_df
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
 
     @staticmethod
-    def stream_group_min_max(df, group_columns, value_column, output_type='float'):
+    def stream_group_min_max(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the minimum and maximum for each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).agg(
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        result_df = df.groupby(group_columns, observed=True).agg(
             min=(value_column, 'min'),
             max=(value_column, 'max')
         ).reset_index()
         result_df["min"] = StreamAggregations._format_output(result_df["min"], output_type)
         result_df["max"] = StreamAggregations._format_output(result_df["max"], output_type)
-        return result_df
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
 
     @staticmethod
-    def stream_group_std_var(df, group_columns, value_column, output_type='float'):
+    def stream_group_std_var(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the standard deviation and variance for each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).agg(
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        result_df = df.groupby(group_columns, observed=True).agg(
             std=(value_column, 'std'),
             var=(value_column, 'var')
         ).reset_index()
         result_df["std"] = StreamAggregations._format_output(result_df["std"], output_type)
         result_df["var"] = StreamAggregations._format_output(result_df["var"], output_type)
-        return result_df
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
 
     @staticmethod
-    def stream_group_mad(df, group_columns, value_column, output_type='float'):
+    def stream_group_mad(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the mean absolute deviation for each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).agg(
-            mad=(value_column, lambda x: (abs(x - x.mean())).mean())
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        grouped = df.groupby(group_columns, observed=True)[value_column]
+        result_df = pd.DataFrame(
+            {'mad': StreamAggregations._group_mad(df[value_column], grouped)},
+            index=grouped.size().index
         ).reset_index()
         result_df["mad"] = StreamAggregations._format_output(result_df["mad"], output_type)
-        return result_df
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
 
     @staticmethod
-    def stream_group_prod(df, group_columns, value_column, output_type='float'):
+    def stream_group_prod(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the product of all items in each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).agg(
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        result_df = df.groupby(group_columns, observed=True).agg(
             prod=(value_column, 'prod')
         ).reset_index()
         result_df["prod"] = StreamAggregations._format_output(result_df["prod"], output_type)
-        return result_df
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
 
     @staticmethod
-    def stream_group_sum(df, group_columns, value_column, output_type='float'):
+    def stream_group_sum(df, group_columns, value_column, output_type='float', native_keys=False):
         """
         Computes the sum of all items in each group.
         """
-        StreamAggregations._validate_inputs(df, group_columns, value_column)
-        result_df = df.groupby(group_columns).agg(
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        result_df = df.groupby(group_columns, observed=True).agg(
             sum=(value_column, 'sum')
         ).reset_index()
         result_df["sum"] = StreamAggregations._format_output(result_df["sum"], output_type)
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
+
+    @staticmethod
+    def _normalize_metrics(metrics, supported):
+        """
+        Normalizes the requested metrics to a list and checks they are supported.
+        """
+        if isinstance(metrics, str):
+            metrics = [metrics]
+        metrics = list(metrics)
+        if not metrics:
+            raise ValueError("At least one metric must be requested.")
+        unsupported = [metric for metric in metrics if metric not in supported]
+        if unsupported:
+            raise ValueError(f"Unsupported metrics {unsupported}. Supported metrics are {list(supported)}.")
+        return metrics
+
+    @staticmethod
+    def _group_mad(values, grouped):
+        """
+        Computes the mean absolute deviation of each group without calling Python once per group.
+
+        Group means are broadcast back to the rows with a transform and the absolute deviations are
+        averaged per group with bincount over the group codes. The result follows the group order
+        of the aggregations computed on `grouped`.
+        """
+        codes = grouped.ngroup().to_numpy()
+        deviations = (values - grouped.transform('mean')).abs().to_numpy(dtype=float)
+        # Rows with a missing key (code NaN) or a missing value do not contribute
+        valid = ~np.isnan(deviations) & ~np.isnan(codes)
+        codes = codes[valid].astype(np.intp)
+        totals = np.bincount(codes, weights=deviations[valid], minlength=grouped.ngroups)
+        counts = np.bincount(codes, minlength=grouped.ngroups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return totals / counts
+
+    @staticmethod
+    def _group_metrics(values, grouped, metrics):
+        """
+        Computes every requested metric on a single SeriesGroupBy so the group keys are factorized once.
+        """
+        # std is derived from var, so each underlying aggregation runs at most once
+        funcs = {}
+        for metric in metrics:
+            func_name = 'var' if metric == 'std' else metric
+            if metric != 'mad':
+                funcs.setdefault(func_name, StreamAggregations._AGG_FUNCS[metric])
+        result = grouped.agg(**funcs) if funcs else pd.DataFrame(index=grouped.size().index)
+        if 'std' in metrics:
+            result['std'] = result['var'] ** 0.5
+        if 'mad' in metrics:
+            result['mad'] = StreamAggregations._group_mad(values, grouped)
+        return result[metrics]
+
+    @staticmethod
+    def _parallel_group_metrics(values, grouped, metrics, n_jobs, executor):
+        """
+        Computes the metrics of stream_group_agg with the groups split across n_jobs workers.
+
+        Rows are partitioned by their group code (code % n_jobs), so every group lands in exactly one
+        partition and the partial results only need to be concatenated. Process workers read the values
+        and codes from shared memory instead of receiving pickled frames.
+        """
+        labels = grouped.size().index
+        codes = grouped.ngroup().to_numpy()
+        # Rows with a missing key (NaN code) get -1 and are excluded, as in a regular groupby
+        if codes.dtype.kind == 'f':
+            codes = np.where(np.isnan(codes), -1, codes)
+        codes = codes.astype(np.int64)
+        array = values.to_numpy()
+        if array.dtype.kind not in 'iufb':
+            array = values.to_numpy(dtype=float, na_value=np.nan)
+
+        if executor == 'thread':
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                futures = [pool.submit(_aggregate_partition, array, codes, partition, n_jobs, metrics)
+                           for partition in range(n_jobs)]
+                parts = [future.result() for future in futures]
+        elif executor == 'process':
+            blocks = [_to_shared_memory(array), _to_shared_memory(codes)]
+            try:
+                specs = [(block.name, arr.shape, arr.dtype.str) for block, arr in zip(blocks, (array, codes))]
+                with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                    futures = [pool.submit(_aggregate_shared_partition, specs[0], specs[1], partition, n_jobs, metrics)
+                               for partition in range(n_jobs)]
+                    parts = [future.result() for future in futures]
+            finally:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+        else:
+            raise ValueError("Invalid 'executor' value. It must be either 'process' or 'thread'.")
+
+        result = pd.concat(parts).sort_index()
+        result.index = labels[result.index.to_numpy()]
+        return result
+
+    @staticmethod
+    def stream_group_agg(df, group_columns, value_column, metrics, output_type='float', native_keys=False,
+                         n_jobs=1, executor='process'):
+        """
+        Computes several aggregations for each group in a single call.
+
+        Inputs are validated once and the group keys are factorized once, instead of once per
+        stream_group_* call. Metric columns match the ones produced by the individual methods.
+
+        Args:
+            df (pd.DataFrame): Input data.
+            group_columns (list): Columns to group by.
+            value_column (str): Numeric column to aggregate.
+            metrics (list): Any of 'count', 'first', 'last', 'mean', 'median', 'min', 'max',
+                'std', 'var', 'mad', 'prod', 'sum'.
+            output_type (str): Either 'int' or 'float'.
+            native_keys (bool): Group on the native (numeric, categorical, ...) keys instead of
+                casting them to strings first; labels are only converted to strings in the result.
+            n_jobs (int): Number of workers the groups are partitioned across (1 runs in-process).
+            executor (str): Either 'process' (ProcessPoolExecutor over shared memory) or 'thread'
+                (ThreadPoolExecutor, useful where the pandas kernels release the GIL).
+
+        Returns:
+            pd.DataFrame: One row per group with a column per requested metric.
+        """
+        metrics = StreamAggregations._normalize_metrics(metrics, StreamAggregations._AGG_FUNCS)
+        if not isinstance(n_jobs, int) or n_jobs <= 0:
+            raise ValueError("'n_jobs' must be a positive integer.")
+        df = StreamAggregations._validate_inputs(df, group_columns, value_column, native_keys)
+        grouped = df.groupby(group_columns, observed=True)[value_column]
+        if n_jobs > 1 and not df.empty:
+            result = StreamAggregations._parallel_group_metrics(df[value_column], grouped, metrics, n_jobs, executor)
+        else:
+            result = StreamAggregations._group_metrics(df[value_column], grouped, metrics)
+        result_df = result.reset_index()
+        for metric in metrics:
+            result_df[metric] = StreamAggregations._format_output(result_df[metric], output_type)
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
+
+    @staticmethod
+    def _chunk_partial(chunk, group_columns, value_column):
+        """
+        Reduces one chunk to its per-group partial state.
+        """
+        grouped = chunk.groupby(group_columns, sort=False, observed=True)[value_column]
+        partial = grouped.agg(['size', 'count', 'sum', 'min', 'max', 'first', 'last', 'prod', 'var'])
+        # Keep the sum of squared deviations rather than the variance so partials can be merged
+        partial['m2'] = (partial.pop('var') * (partial['count'] - 1)).fillna(0.0)
+        return partial
+
+    @staticmethod
+    def _merge_partials(partials):
+        """
+        Merges per-group partial states into a single state with one row per group.
+        """
+        combined = pd.concat(partials)
+        levels = list(range(combined.index.nlevels))
+        grouped = combined.groupby(level=levels, sort=False)
+        merged = grouped.agg({
+            'size': 'sum', 'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max',
+            'first': 'first', 'last': 'last', 'prod': 'prod', 'm2': 'sum'
+        })
+        # Parallel variance update: add the spread of each partial mean around the merged mean
+        partial_mean = combined['sum'] / combined['count']
+        merged_mean = (merged['sum'] / merged['count']).reindex(combined.index).to_numpy()
+        spread = (combined['count'] * (partial_mean - merged_mean) ** 2).fillna(0.0)
+        merged['m2'] += spread.groupby(level=levels, sort=False).sum()
+        return merged
+
+    @staticmethod
+    def _finalize_partials(state, metrics, output_type, median=None):
+        """
+        Turns a merged partial state into the output frame for the requested metrics.
+        """
+        count = state['count']
+        var = state['m2'] / (count - 1).where(count > 1)
+        values = {
+            'count': state['size'],
+            'first': state['first'],
+            'last': state['last'],
+            'mean': state['sum'] / count,
+            'min': state['min'],
+            'max': state['max'],
+            'std': var ** 0.5,
+            'var': var,
+            'prod': state['prod'],
+            'sum': state['sum'],
+            'median': median
+        }
+        result_df = pd.DataFrame({metric: values[metric] for metric in metrics}).sort_index().reset_index()
+        for metric in metrics:
+            result_df[metric] = StreamAggregations._format_output(result_df[metric], output_type)
         return result_df
+
+    @staticmethod
+    def stream_group_agg_chunks(chunks, group_columns, value_column, metrics, output_type='float', native_keys=False,
+                                median_mode='approx', median_error=0.01, spill_dir=None, spill_partitions=16):
+        """
+        Computes group aggregations over an iterator of DataFrame chunks (e.g. pd.read_csv(..., chunksize=...)).
+
+        Each chunk is reduced to a mergeable per-group partial state (count, sum, min, max, first, last,
+        sum of squares and product) that is folded into a running state, so memory is bounded by the number
+        of groups rather than the number of rows. Metric columns match the ones produced by the
+        corresponding stream_group_* methods.
+
+        Medians cannot be rebuilt from such a state. With median_mode='approx' each group keeps a mergeable
+        KLL quantile sketch of fixed size, whose rank error is about median_error (groups small enough to
+        fit in the sketch get the exact median). With median_mode='exact' the rows are hash-partitioned by
+        group into spill files and the medians are computed one partition at a time.
+
+        Args:
+            chunks (Iterable): Iterator of DataFrame chunks sharing the same columns.
+            group_columns (list): Columns to group by.
+            value_column (str): Numeric column to aggregate.
+            metrics (list): Any of 'count', 'first', 'last', 'mean', 'median', 'min', 'max', 'std', 'var',
+                'prod', 'sum'.
+            output_type (str): Either 'int' or 'float'.
+            native_keys (bool): Group on the native keys instead of casting them to strings first.
+            median_mode (str): Either 'approx' (quantile sketch) or 'exact' (spill to disk).
+            median_error (float): Target rank error of the quantile sketch, between 0 and 1.
+            spill_dir (str): Directory for the spill files of the exact median (a temporary directory
+                by default). The files are removed once the result is computed.
+            spill_partitions (int): Number of spill files the groups are hash-partitioned into.
+
+        Returns:
+            pd.DataFrame: One row per group with a column per requested metric.
+        """
+        metrics = StreamAggregations._normalize_metrics(metrics, StreamAggregations._CHUNK_METRICS)
+        if isinstance(group_columns, str):
+            group_columns = [group_columns]
+        if isinstance(chunks, pd.DataFrame):
+            chunks = [chunks]
+
+        medians = None
+        if 'median' in metrics:
+            if median_mode == 'approx':
+                medians = _SketchMedians(median_error)
+            elif median_mode == 'exact':
+                medians = _SpilledMedians(spill_dir, spill_partitions)
+            else:
+                raise ValueError("Invalid 'median_mode' value. It must be either 'approx' or 'exact'.")
+
+        try:
+            state = None
+            for chunk in chunks:
+                if not isinstance(chunk, pd.DataFrame):
+                    raise TypeError("Every chunk must be a Pandas DataFrame.")
+                if chunk.empty:
+                    continue
+                chunk = StreamAggregations._validate_inputs(chunk, group_columns, value_column, native_keys)
+                partial = StreamAggregations._chunk_partial(chunk, group_columns, value_column)
+                state = partial if state is None else StreamAggregations._merge_partials([state, partial])
+                if medians is not None:
+                    medians.update(chunk, group_columns, value_column)
+
+            if state is None:
+                return pd.DataFrame(columns=group_columns + metrics)
+            median = medians.medians(state.index) if medians is not None else None
+        finally:
+            if medians is not None:
+                medians.close()
+        result_df = StreamAggregations._finalize_partials(state, metrics, output_type, median)
+        return StreamAggregations._format_keys(result_df, group_columns, native_keys)
+
+
+def _to_shared_memory(array):
+    """Copies an array into a new shared memory block."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block
+
+
+def _aggregate_partition(values, codes, partition, n_partitions, metrics):
+    """Computes the metrics of the groups whose code falls in one partition, indexed by group code."""
+    mask = (codes >= 0) & (codes % n_partitions == partition)
+    series = pd.Series(values[mask])
+    grouped = series.groupby(codes[mask])
+    return StreamAggregations._group_metrics(series, grouped, metrics)
+
+
+def _aggregate_shared_partition(values_spec, codes_spec, partition, n_partitions, metrics):
+    """Process pool entry point: attaches to the shared values and codes and aggregates one partition."""
+    blocks = [shared_memory.SharedMemory(name=spec[0]) for spec in (values_spec, codes_spec)]
+    try:
+        values, codes = [np.ndarray(spec[1], dtype=np.dtype(spec[2]), buffer=block.buf)
+                         for block, spec in zip(blocks, (values_spec, codes_spec))]
+        result = _aggregate_partition(values, codes, partition, n_partitions, metrics)
+        # Drop the views on the shared buffers before closing them
+        del values, codes
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+
+
+class _QuantileSketch:
+    """
+    Mergeable KLL quantile sketch over a stream of floats.
+
+    Items are kept in compactors where an item at level h stands for 2**h inputs. When a compactor
+    overflows it is sorted and every other item (random offset) is promoted to the next level, so the
+    number of retained items stays below about 3 * k whatever the stream length, with a rank error of
+    roughly 2 / k.
+    """
+
+    def __init__(self, k, seed=0):
+        self.k = k
+        self.n = 0
+        self.compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        """Returns the number of items the compactor at `level` may hold before compacting."""
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        """Compacts every overflowing level, from the bottom up."""
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays at this level
+                leftover = len(items) % 2
+                promoted = items[leftover:][self._rng.integers(2)::2]
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+                self.compactors[level] = items[:leftover]
+            level += 1
+
+    def update(self, values):
+        """Adds an array of values, ignoring NaN."""
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Folds another sketch into this one."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self._compress()
+
+    def quantile(self, q):
+        """Returns the (approximate) q-quantile, or NaN for an empty sketch."""
+        if self.n == 0:
+            return np.nan
+        if len(self.compactors) == 1:
+            # Nothing was compacted yet: every value is still here, answer exactly
+            return float(np.quantile(self.compactors[0], q))
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2.0 ** level) for level, c in enumerate(self.compactors)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        position = min(np.searchsorted(cumulative, q * cumulative[-1]), len(items) - 1)
+        return float(items[order][position])
+
+
+class _SketchMedians:
+    """Approximate per-group medians backed by one quantile sketch per group."""
+
+    def __init__(self, error):
+        if not 0 < error < 1:
+            raise ValueError("'median_error' must be between 0 and 1.")
+        self.k = int(np.ceil(2 / error))
+        self.sketches = {}
+
+    def update(self, chunk, group_columns, value_column):
+        """Feeds the values of one chunk to the sketches of their groups."""
+        grouped = chunk.groupby(group_columns, sort=False, observed=True)[value_column]
+        keys = grouped.size().index
+        codes = grouped.ngroup().to_numpy()
+        valid = ~np.isnan(codes)
+        codes = codes[valid].astype(np.intp)
+        # Sort the rows by group once and split, instead of iterating the groupby
+        order = np.argsort(codes, kind='stable')
+        values = chunk[value_column].to_numpy(dtype=float)[valid][order]
+        splits = np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1]
+        for key, group_values in zip(keys, np.split(values, splits)):
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = _QuantileSketch(self.k)
+            sketch.update(group_values)
+
+    def medians(self, index):
+        """Returns the median of every group in `index`."""
+        return pd.Series([self.sketches[key].quantile(0.5) for key in index], index=index)
+
+    def close(self):
+        self.sketches = {}
+
+
+class _SpilledMedians:
+    """Exact per-group medians computed from rows spilled to hash-partitioned files."""
+
+    def __init__(self, spill_dir, partitions):
+        if not isinstance(partitions, int) or partitions <= 0:
+            raise ValueError("'spill_partitions' must be a positive integer.")
+        self.partitions = partitions
+        self._tmpdir = tempfile.TemporaryDirectory(dir=spill_dir, prefix='biztools_median_')
+        self.paths = [os.path.join(self._tmpdir.name, f"partition_{i}.pkl") for i in range(partitions)]
+        self.group_columns = None
+        self.value_column = None
+
+    def update(self, chunk, group_columns, value_column):
+        """Appends the rows of one chunk to the spill file of their group's partition."""
+        self.group_columns, self.value_column = group_columns, value_column
+        rows = chunk[group_columns + [value_column]]
+        partition = pd.util.hash_pandas_object(rows[group_columns], index=False).to_numpy() % self.partitions
+        for i, path in enumerate(self.paths):
+            part = rows[partition == i]
+            if not part.empty:
+                with open(path, 'ab') as f:
+                    pickle.dump(part, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _read_partition(self, path):
+        """Loads every frame spilled to one partition file."""
+        frames = []
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    frames.append(pickle.load(f))
+                except EOFError:
+                    return frames
+
+    def medians(self, index):
+        """Returns the median of every group in `index`, loading one partition at a time."""
+        results = []
+        for path in self.paths:
+            if os.path.exists(path):
+                part = pd.concat(self._read_partition(path))
+                results.append(part.groupby(self.group_columns, observed=True)[self.value_column].median())
+        return pd.concat(results).reindex(index)
+
+    def close(self):
+        self._tmpdir.cleanup()
@@ -1,3 +1,7 @@
+import json
+import math
+from collections.abc import Mapping
+import numpy as np
 import pandas as pd
 
 class StreamKpiCalculations:
@@ -16,9 +20,30 @@ class StreamKpiCalculations:
         """Validate that the specified column exists in the DataFrame."""
         if column not in df.columns:
             raise ValueError(f"Column '{column}' does not exist in the DataFrame.")
+
+    _OUTPUTS = ('frame', 'series', 'array')
+
+    @staticmethod
+    def _emit(df, values, new_col_name, output):
+        """
+        Returns a KPI Series in the requested output: written into df as `new_col_name` ('frame'),
+        the Series itself ('series') or its values ('array').
+        """
+        if output == 'frame':
+            df[new_col_name] = values
+            return df
+        if output == 'series':
+            return values.rename(new_col_name)
+        return values.to_numpy()
+
+    @staticmethod
+    def _validate_output(output, outputs=_OUTPUTS):
+        if output not in outputs:
+            raise ValueError(f"Output must be one of {', '.join(outputs)}.")
     
     @staticmethod
-    def stream_revenue_growth(data, revenue_col, new_col_name="revenue_growth"):
+    def stream_revenue_growth(data, revenue_col, new_col_name="revenue_growth", group_cols=None, order_col=None,
+                              output='frame'):
         """
         Calculates the revenue growth between each row in a specified column.
         
@@ -26,23 +51,31 @@ class StreamKpiCalculations:
             data (Iterable): Input data (list, tuple, Series, or DataFrame).
             revenue_col (str): The column containing the revenue values.
             new_col_name (str): The new column to store the revenue growth.
+            group_cols (str or list, optional): Columns identifying separate series (e.g. customer,
+                product line); the growth is computed within each group. Rows with a null key get NaN.
+            order_col (str, optional): Column giving the time order of the rows (row order otherwise).
+            output (str): 'frame' to add the column to the DataFrame and return it, 'series' to return only
+                the computed Series or 'array' to return only its NumPy array (the input is left unchanged).
         
         Returns:
-            pd.DataFrame: DataFrame with the revenue growth column.
+            pd.DataFrame, pd.Series or np.ndarray: The revenue growth, as selected by `output`.
         """
+        StreamKpiCalculations._validate_output(output)
         df = StreamKpiCalculations._validate_iterable(data)
         StreamKpiCalculations._validate_column(df, revenue_col)
         
         # Calculate revenue growth as percentage change
-        df[new_col_name] = df[revenue_col].pct_change() * 100  # Percentage growth
+        if group_cols is None and order_col is None:
+            growth = df[revenue_col].pct_change() * 100  # Percentage growth
+        else:
+            growth = pd.Series(StreamKpiCalculations._group_pct_change(df, revenue_col, group_cols, order_col) * 100,
+                               index=df.index)
         
         # Round off values to 2 decimals
-        df[new_col_name] = df[new_col_name].round(2)
-        
-        return df
+        return StreamKpiCalculations._emit(df, growth.round(2), new_col_name, output)
 
     @staticmethod
-    def stream_churn_rate(data, start_col, end_col, new_col_name="churn_rate"):
+    def stream_churn_rate(data, start_col, end_col, new_col_name="churn_rate", output='frame'):
         """
         Calculates the churn rate between two columns (e.g., start and end of customer lifecycle).
         
@@ -51,24 +84,24 @@ class StreamKpiCalculations:
             start_col (str): Column containing the starting count (e.g., active customers at the start).
             end_col (str): Column containing the ending count (e.g., active customers at the end).
             new_col_name (str): The new column to store the churn rate.
+            output (str): 'frame', 'series' or 'array', as in stream_revenue_growth.
         
         Returns:
-            pd.DataFrame: DataFrame with the churn rate column.
+            pd.DataFrame, pd.Series or np.ndarray: The churn rate, as selected by `output`.
         """
+        StreamKpiCalculations._validate_output(output)
         df = StreamKpiCalculations._validate_iterable(data)
         StreamKpiCalculations._validate_column(df, start_col)
         StreamKpiCalculations._validate_column(df, end_col)
         
         # Calculate churn rate: (start - end) / start
-        df[new_col_name] = ((df[start_col] - df[end_col]) / df[start_col]) * 100
+        churn = ((df[start_col] - df[end_col]) / df[start_col]) * 100
         
         # Round off values to 2 decimals
-        df[new_col_name] = df[new_col_name].round(2)
-        
-        return df
+        return StreamKpiCalculations._emit(df, churn.round(2), new_col_name, output)
 
     @staticmethod
-    def stream_growth_rate(data, start_col, end_col, new_col_name="growth_rate"):
+    def stream_growth_rate(data, start_col, end_col, new_col_name="growth_rate", output='frame'):
         """
         Calculates the growth rate between two columns.
         
@@ -77,19 +110,518 @@ class StreamKpiCalculations:
             start_col (str): Column containing the starting value.
             end_col (str): Column containing the ending value.
             new_col_name (str): The new column to store the growth rate.
+            output (str): 'frame', 'series' or 'array', as in stream_revenue_growth.
         
         Returns:
-            pd.DataFrame: DataFrame with the growth rate column.
+            pd.DataFrame, pd.Series or np.ndarray: The growth rate, as selected by `output`.
         """
+        StreamKpiCalculations._validate_output(output)
         df = StreamKpiCalculations._validate_iterable(data)
         StreamKpiCalculations._validate_column(df, start_col)
         StreamKpiCalculations._validate_column(df, end_col)
         
         # Calculate growth rate: (end - start) / start
-        df[new_col_name] = ((df[end_col] - df[start_col]) / df[start_col]) * 100
+        growth = ((df[end_col] - df[start_col]) / df[start_col]) * 100
         
         # Round off values to 2 decimals
-        df[new_col_name] = df[new_col_name].round(2)
+        return StreamKpiCalculations._emit(df, growth.round(2), new_col_name, output)
+
+    @staticmethod
+    def stream_kpis(data, kpis, output='frame'):
+        """
+        Calculates several KPIs in one call and adds all their columns at once, instead of chaining
+        the single-KPI methods (each of which inserts a column into the frame).
         
+        Args:
+            data (Iterable): Input data (list, tuple, or DataFrame).
+            kpis (list of dict): One dict per KPI, with 'kpi' set to 'revenue_growth', 'churn_rate' or
+                'growth_rate' and the other keys passed to the matching method (e.g. revenue_col,
+                start_col, end_col, new_col_name, group_cols, order_col).
+            output (str): 'frame' to return the data with the KPI columns appended in a single
+                concatenation (the input DataFrame is left unchanged), 'columns' to return only the KPI
+                columns as a DataFrame, or 'array' to return a dict of NumPy arrays by column name.
+        
+        Returns:
+            pd.DataFrame or dict: The KPI columns, as selected by `output`.
+        """
+        StreamKpiCalculations._validate_output(output, ('frame', 'columns', 'array'))
+        df = StreamKpiCalculations._validate_iterable(data)
+        methods = {
+            'revenue_growth': StreamKpiCalculations.stream_revenue_growth,
+            'churn_rate': StreamKpiCalculations.stream_churn_rate,
+            'growth_rate': StreamKpiCalculations.stream_growth_rate
+        }
+        columns = {}
+        for spec in kpis:
+            options = dict(spec)
+            kpi = options.pop('kpi', None)
+            if kpi not in methods:
+                raise ValueError(f"Unknown KPI '{kpi}'. Supported KPIs are: {', '.join(methods)}.")
+            options.setdefault('new_col_name', kpi)
+            if options['new_col_name'] in columns:
+                raise ValueError(f"Duplicate KPI column '{options['new_col_name']}'.")
+            values = methods[kpi](df, output='array', **options)
+            columns[options['new_col_name']] = values
+        if output == 'array':
+            return columns
+        kpi_frame = pd.DataFrame(columns, index=df.index)
+        if output == 'columns':
+            return kpi_frame
+        return pd.concat([df.drop(columns=[name for name in columns if name in df.columns]), kpi_frame], axis=1)
+
+    @staticmethod
+    def stream_group_churn_rate(data, group_cols, start_col, end_col, order_col=None, new_col_name="churn_rate"):
+        """
+        Calculates the churn rate of each group (e.g. territory or product line) over its rows in time
+        order: from the start count of its first row to the end count of its last row.
+        
+        Args:
+            data (Iterable): Input data (list, tuple, or DataFrame).
+            group_cols (str or list): Columns identifying the groups.
+            start_col (str): Column containing the starting count (e.g., active customers at the start).
+            end_col (str): Column containing the ending count (e.g., active customers at the end).
+            order_col (str, optional): Column giving the time order of the rows (row order otherwise).
+            new_col_name (str): The new column to store the churn rate.
+        
+        Returns:
+            pd.DataFrame: One row per group with the group columns, the first start count, the last end
+            count and the churn rate.
+        """
+        return StreamKpiCalculations._group_span_rate(data, group_cols, start_col, end_col, order_col,
+                                                      new_col_name, -1)
+
+    @staticmethod
+    def stream_group_growth_rate(data, group_cols, start_col, end_col, order_col=None, new_col_name="growth_rate"):
+        """
+        Calculates the growth rate of each group over its rows in time order: from the start value of its
+        first row to the end value of its last row.
+        
+        Args:
+            data (Iterable): Input data (list, tuple, or DataFrame).
+            group_cols (str or list): Columns identifying the groups.
+            start_col (str): Column containing the starting value.
+            end_col (str): Column containing the ending value.
+            order_col (str, optional): Column giving the time order of the rows (row order otherwise).
+            new_col_name (str): The new column to store the growth rate.
+        
+        Returns:
+            pd.DataFrame: One row per group with the group columns, the first start value, the last end
+            value and the growth rate.
+        """
+        return StreamKpiCalculations._group_span_rate(data, group_cols, start_col, end_col, order_col,
+                                                      new_col_name, 1)
+
+    @staticmethod
+    def _group_order(df, group_cols, order_col):
+        """
+        Returns the group code of each row (-1 for rows with a null key) and the positions of the rows
+        with a valid key sorted by group, then by `order_col` (row order on ties), in one stable sort.
+        """
+        if group_cols is None:
+            codes = np.zeros(len(df), dtype=np.int64)
+        else:
+            if isinstance(group_cols, str):
+                group_cols = [group_cols]
+            for column in group_cols:
+                StreamKpiCalculations._validate_column(df, column)
+            codes = df.groupby(group_cols, observed=True).ngroup().to_numpy()
+        rows = np.flatnonzero(codes >= 0)
+        if order_col is None:
+            order = rows[np.argsort(codes[rows], kind='stable')]
+        else:
+            StreamKpiCalculations._validate_column(df, order_col)
+            # Sorted integer ranks of the order values, nulls last like sort_values
+            ranks, uniques = pd.factorize(df[order_col], sort=True)
+            ranks[ranks < 0] = len(uniques)
+            n_ranks = len(uniques) + 1
+            if (codes.max(initial=0) + 1) * n_ranks < 2 ** 62:
+                # One stable argsort on a combined integer key is about twice as fast as lexsort
+                order = rows[np.argsort(codes[rows] * n_ranks + ranks[rows], kind='stable')]
+            else:
+                order = rows[np.lexsort((ranks[rows], codes[rows]))]
+        return codes, order
+
+    @staticmethod
+    def _group_pct_change(df, column, group_cols, order_col):
+        """Returns pct_change of `column` within each group, in time order, aligned with the rows of df."""
+        codes, order = StreamKpiCalculations._group_order(df, group_cols, order_col)
+        values = df[column].to_numpy(dtype=float, na_value=np.nan)[order]
+        sorted_codes = codes[order]
+        previous = np.empty_like(values)
+        previous[:1] = np.nan
+        previous[1:] = values[:-1]
+        # The first row of each group has no previous value
+        previous[1:][sorted_codes[1:] != sorted_codes[:-1]] = np.nan
+        change = np.full(len(df), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change[order] = values / previous - 1
+        return change
+
+    @staticmethod
+    def _group_span_rate(data, group_cols, start_col, end_col, order_col, new_col_name, sign):
+        """
+        Computes sign * (last end - first start) / first start * 100 for each group, over its rows in time
+        order, from one sort of the frame by group.
+        """
+        df = StreamKpiCalculations._validate_iterable(data)
+        StreamKpiCalculations._validate_column(df, start_col)
+        StreamKpiCalculations._validate_column(df, end_col)
+        if isinstance(group_cols, str):
+            group_cols = [group_cols]
+        codes, order = StreamKpiCalculations._group_order(df, group_cols, order_col)
+        sorted_codes = codes[order]
+        firsts = np.flatnonzero(np.diff(sorted_codes, prepend=-2) != 0)
+        lasts = np.flatnonzero(np.diff(sorted_codes, append=-2) != 0)
+        result = df[group_cols].iloc[order[firsts]].reset_index(drop=True)
+        start = df[start_col].iloc[order[firsts]].reset_index(drop=True)
+        end = df[end_col].iloc[order[lasts]].reset_index(drop=True)
+        result[start_col] = start
+        result[end_col] = end
+        result[new_col_name] = ((sign * (end - start) / start) * 100).round(2)
+        return result
+
+    @staticmethod
+    def _record_value(record, column):
+        """Returns the value of `column` in a record (a dict-like row) or the record itself if it is a scalar."""
+        if isinstance(record, Mapping):
+            if column not in record:
+                raise ValueError(f"Column '{column}' does not exist in the record.")
+            record = record[column]
+        if record is None:
+            return math.nan
+        try:
+            return float(record)
+        except (ValueError, TypeError):
+            raise ValueError(f"Non-numeric value found: {record}.")
+
+    @staticmethod
+    def _batch_values(batch, column):
+        """Returns the values of `column` in a micro-batch (DataFrame, or Series/array of values) as floats."""
+        if isinstance(batch, pd.DataFrame):
+            StreamKpiCalculations._validate_column(batch, column)
+            batch = batch[column]
+        return np.asarray(batch, dtype=float)
+
+    @staticmethod
+    def _divide(numerator, denominator):
+        """Divides two floats like pandas does, returning inf or NaN on a zero denominator."""
+        if denominator == 0:
+            if numerator == 0 or math.isnan(numerator):
+                return math.nan
+            return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+        return numerator / denominator
+
+    @staticmethod
+    def _round2(value):
+        """Rounds to 2 decimals the way Series.round(2) does (scale by 100, round half to even, unscale)."""
+        if not math.isfinite(value):
+            return value
+        return round(value * 100) / 100
+
+    @staticmethod
+    def _is_batch(record):
+        return isinstance(record, (pd.DataFrame, pd.Series, np.ndarray))
+
+    @staticmethod
+    def iter_revenue_growth(records, revenue_col=None):
+        """
+        Yields the revenue growth of a live feed as each record or micro-batch arrives, with the same
+        values as stream_revenue_growth on the whole feed.
+
+        The previous revenue is carried across records and batches, so only O(1) state is kept.
+
+        Args:
+            records (Iterable): Records (dict-like rows holding `revenue_col`, or revenue values) and/or
+                micro-batches (DataFrames holding `revenue_col`, or Series/arrays of revenue values).
+            revenue_col (str): The column containing the revenue values in dict-like rows and DataFrames.
+
+        Yields:
+            float for a record, np.ndarray for a micro-batch: percentage growth rounded to 2 decimals.
+        """
+        previous = math.nan
+        for record in records:
+            if StreamKpiCalculations._is_batch(record):
+                values = StreamKpiCalculations._batch_values(record, revenue_col)
+                shifted = np.concatenate(([previous], values[:-1]))
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    growth = np.round((values / shifted - 1) * 100, 2)
+                if len(values) > 0:
+                    previous = values[-1].item()
+                yield growth
+            else:
+                value = StreamKpiCalculations._record_value(record, revenue_col)
+                growth = (StreamKpiCalculations._divide(value, previous) - 1) * 100
+                previous = value
+                yield StreamKpiCalculations._round2(growth)
+
+    @staticmethod
+    def _iter_ratio(records, start_col, end_col, sign):
+        """Yields sign * (end - start) / start * 100, rounded to 2 decimals, for each record or micro-batch."""
+        for record in records:
+            if StreamKpiCalculations._is_batch(record):
+                if not isinstance(record, pd.DataFrame):
+                    raise ValueError("Micro-batches must be DataFrames holding the start and end columns.")
+                start = StreamKpiCalculations._batch_values(record, start_col)
+                end = StreamKpiCalculations._batch_values(record, end_col)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    yield np.round((sign * (end - start) / start) * 100, 2)
+            else:
+                start = StreamKpiCalculations._record_value(record, start_col)
+                end = StreamKpiCalculations._record_value(record, end_col)
+                ratio = StreamKpiCalculations._divide(sign * (end - start), start)
+                yield StreamKpiCalculations._round2(ratio * 100)
+
+    @staticmethod
+    def iter_churn_rate(records, start_col, end_col):
+        """
+        Yields the churn rate of each record (dict-like row) or micro-batch (DataFrame) as it arrives,
+        with the same values as stream_churn_rate.
+
+        Yields:
+            float for a record, np.ndarray for a micro-batch: churn rate rounded to 2 decimals.
+        """
+        return StreamKpiCalculations._iter_ratio(records, start_col, end_col, -1)
+
+    @staticmethod
+    def iter_growth_rate(records, start_col, end_col):
+        """
+        Yields the growth rate of each record (dict-like row) or micro-batch (DataFrame) as it arrives,
+        with the same values as stream_growth_rate.
+
+        Yields:
+            float for a record, np.ndarray for a micro-batch: growth rate rounded to 2 decimals.
+        """
+        return StreamKpiCalculations._iter_ratio(records, start_col, end_col, 1)
+
+
+class IncrementalKpiCalculator:
+    """
+    Stateful revenue growth and per-group churn/growth rates over data that arrives in batches (e.g. one
+    batch per day), with a JSON snapshot to resume after a restart.
+
+    For each series (each group of `group_cols`, or the whole data) the calculator keeps the last revenue,
+    the first start count and the last end count, so each update only processes the new rows and gives
+    the same values as running StreamKpiCalculations over the full history. With `order_col`, rows are
+    taken in time order and rows before the latest order value already processed (the watermark) are
+    skipped as already seen. Rows at the watermark are processed unless an identical row (same group,
+    order value and KPI columns) was already processed at that order value, so batches sharing a date
+    are all counted while a batch sent twice is not. Rows with a missing order value cannot be placed
+    in time and are skipped.
+    """
+
+    _SNAPSHOT_VERSION = 2
+
+    def __init__(self, revenue_col=None, start_col=None, end_col=None, group_cols=None, order_col=None):
+        if revenue_col is None and (start_col is None or end_col is None):
+            raise ValueError("Either revenue_col or both start_col and end_col must be given.")
+        if isinstance(group_cols, str):
+            group_cols = [group_cols]
+        self.revenue_col = revenue_col
+        self.start_col = start_col
+        self.end_col = end_col
+        self.group_cols = group_cols
+        self.order_col = order_col
+        self.watermark = None  # latest order value processed
+        self._watermark_rows = set()  # hashes of the rows processed at the watermark (None: all of them)
+        self._state = None  # DataFrame indexed by group key: last_revenue, first_start, last_end
+
+    def _validate_batch(self, data):
+        df = StreamKpiCalculations._validate_iterable(data)
+        for column in (self.revenue_col, self.start_col, self.end_col, self.order_col):
+            if column is not None:
+                StreamKpiCalculations._validate_column(df, column)
+        if self.order_col is not None:
+            df = df[df[self.order_col].notna()]
+            if self.watermark is not None:
+                order = df[self.order_col]
+                keep = (order > self.watermark).to_numpy(copy=True)
+                at_watermark = (order == self.watermark).to_numpy()
+                if self._watermark_rows and at_watermark.any():
+                    seen = np.fromiter(self._watermark_rows, dtype=np.uint64, count=len(self._watermark_rows))
+                    keep[at_watermark] = ~np.isin(self._row_hashes(df[at_watermark]), seen)
+                elif self._watermark_rows is not None:
+                    keep |= at_watermark
+                df = df[keep]
         return df
 
+    def _row_hashes(self, df):
+        """Returns a stable 64-bit hash of the group, order and KPI values of each row."""
+        columns = (self.group_cols or []) + [self.order_col, self.revenue_col, self.start_col, self.end_col]
+        columns = list(dict.fromkeys(column for column in columns if column is not None))
+        return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+    def _column(self, df, column, order):
+        if column is None:
+            return np.full(len(order), np.nan)
+        return df[column].to_numpy(dtype=float, na_value=np.nan)[order]
+
+    def update(self, data, new_col_name="revenue_growth", output='frame'):
+        """
+        Processes a batch of new rows and updates the state.
+        
+        Args:
+            data (Iterable): The new rows (list, tuple, or DataFrame).
+            new_col_name (str): The new column to store the revenue growth.
+            output (str): 'frame', 'series' or 'array', as in StreamKpiCalculations.stream_revenue_growth.
+        
+        Returns:
+            The revenue growth of the new rows (rows skipped by the watermark are left out), or the
+            batch itself if no revenue_col was given.
+        """
+        StreamKpiCalculations._validate_output(output)
+        df = self._validate_batch(data)
+        codes, order = StreamKpiCalculations._group_order(df, self.group_cols, self.order_col)
+        sorted_codes = codes[order]
+        firsts = np.flatnonzero(np.diff(sorted_codes, prepend=-2) != 0)
+        lasts = np.flatnonzero(np.diff(sorted_codes, append=-2) != 0)
+        if self.group_cols is None:
+            keys = pd.Index(np.zeros(len(firsts), dtype=np.int64))
+        else:
+            keys = pd.MultiIndex.from_frame(df[self.group_cols].iloc[order[firsts]])
+            if len(self.group_cols) == 1:
+                keys = keys.get_level_values(0)
+        revenue = self._column(df, self.revenue_col, order)
+        batch_state = pd.DataFrame({
+            'last_revenue': revenue[lasts],
+            'first_start': self._column(df, self.start_col, order[firsts]),
+            'last_end': self._column(df, self.end_col, order[lasts])
+        }, index=keys)
+
+        result = df
+        if self.revenue_col is not None:
+            previous = np.empty_like(revenue)
+            previous[1:] = revenue[:-1]
+            # The first row of each group in the batch follows the last revenue of the previous batches
+            if self._state is None:
+                previous[firsts] = np.nan
+            else:
+                previous[firsts] = self._state['last_revenue'].reindex(keys).to_numpy()
+            growth = np.full(len(df), np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                growth[order] = (revenue / previous - 1) * 100
+            result = StreamKpiCalculations._emit(df, pd.Series(growth, index=df.index).round(2), new_col_name, output)
+
+        self._merge_state(batch_state)
+        if self.order_col is not None and len(df) > 0:
+            batch_max = df[self.order_col].max()
+            hashes = self._row_hashes(df[(df[self.order_col] == batch_max).to_numpy()])
+            if self.watermark is None or batch_max > self.watermark:
+                self.watermark = batch_max
+                self._watermark_rows = set(hashes.tolist())
+            elif self._watermark_rows is not None:
+                self._watermark_rows.update(hashes.tolist())
+        return result
+
+    def _merge_state(self, batch_state):
+        """Keeps the first start count of known groups and takes everything else from the batch."""
+        if self._state is None:
+            self._state = batch_state
+            return
+        combined = pd.concat([self._state, batch_state])
+        state = combined[~combined.index.duplicated(keep='last')].copy()
+        first_start = combined['first_start'][~combined.index.duplicated(keep='first')]
+        state['first_start'] = first_start.reindex(state.index)
+        self._state = state
+
+    def _rates(self, new_col_name, sign):
+        if self.start_col is None or self.end_col is None:
+            raise ValueError("start_col and end_col are required for churn and growth rates.")
+        # Groups in key order, as stream_group_churn_rate returns them
+        state = self._state.sort_index() if self._state is not None else pd.DataFrame(
+            {'first_start': [], 'last_end': []})
+        if self.group_cols is None:
+            result = pd.DataFrame(index=range(len(state)))
+        elif self._state is None:
+            result = pd.DataFrame(columns=self.group_cols)
+        else:
+            result = state.index.to_frame(index=False)
+            result.columns = self.group_cols
+        start = pd.Series(state['first_start'].to_numpy())
+        end = pd.Series(state['last_end'].to_numpy())
+        result[self.start_col] = start
+        result[self.end_col] = end
+        result[new_col_name] = ((sign * (end - start) / start) * 100).round(2)
+        return result
+
+    def churn_rates(self, new_col_name="churn_rate"):
+        """Returns the churn rate of each group over all rows processed so far, as stream_group_churn_rate."""
+        return self._rates(new_col_name, -1)
+
+    def growth_rates(self, new_col_name="growth_rate"):
+        """Returns the growth rate of each group over all rows processed so far, as stream_group_growth_rate."""
+        return self._rates(new_col_name, 1)
+
+    @staticmethod
+    def _to_json(value):
+        """Converts a group key or order value to a JSON value, tagging timestamps."""
+        if isinstance(value, tuple):
+            return [IncrementalKpiCalculator._to_json(item) for item in value]
+        if isinstance(value, pd.Timestamp):
+            return {'timestamp': value.isoformat()}
+        if isinstance(value, np.generic):
+            return value.item()
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        raise TypeError(f"Cannot store value of type {type(value).__name__} in a snapshot.")
+
+    @staticmethod
+    def _from_json(value):
+        if isinstance(value, list):
+            return tuple(IncrementalKpiCalculator._from_json(item) for item in value)
+        if isinstance(value, dict):
+            return pd.Timestamp(value['timestamp'])
+        return value
+
+    def to_snapshot(self):
+        """Returns the configuration and state as a JSON-serializable dict."""
+        state = self._state if self._state is not None else pd.DataFrame(
+            {'last_revenue': [], 'first_start': [], 'last_end': []})
+        return {
+            'version': self._SNAPSHOT_VERSION,
+            'revenue_col': self.revenue_col,
+            'start_col': self.start_col,
+            'end_col': self.end_col,
+            'group_cols': self.group_cols,
+            'order_col': self.order_col,
+            'watermark': self._to_json(self.watermark),
+            'watermark_rows': sorted(self._watermark_rows) if self._watermark_rows is not None else None,
+            'keys': [self._to_json(key) for key in state.index],
+            'last_revenue': state['last_revenue'].tolist(),
+            'first_start': state['first_start'].tolist(),
+            'last_end': state['last_end'].tolist()
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Rebuilds a calculator from a dict returned by to_snapshot."""
+        if snapshot.get('version') not in (1, cls._SNAPSHOT_VERSION):
+            raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}.")
+        calculator = cls(snapshot['revenue_col'], snapshot['start_col'], snapshot['end_col'],
+                         snapshot['group_cols'], snapshot['order_col'])
+        calculator.watermark = cls._from_json(snapshot['watermark'])
+        # Version 1 snapshots do not list the rows at the watermark, all of them were processed
+        watermark_rows = snapshot.get('watermark_rows')
+        calculator._watermark_rows = set(watermark_rows) if watermark_rows is not None else None
+        if snapshot['keys']:
+            keys = [cls._from_json(key) for key in snapshot['keys']]
+            if calculator.group_cols is not None and len(calculator.group_cols) > 1:
+                index = pd.MultiIndex.from_tuples(keys, names=calculator.group_cols)
+            else:
+                index = pd.Index(keys, name=calculator.group_cols[0] if calculator.group_cols else None)
+            calculator._state = pd.DataFrame({
+                'last_revenue': snapshot['last_revenue'],
+                'first_start': snapshot['first_start'],
+                'last_end': snapshot['last_end']
+            }, index=index, dtype=float)
+        return calculator
+
+    def save(self, path):
+        """Writes the snapshot to a JSON file."""
+        with open(path, 'w') as file:
+            json.dump(self.to_snapshot(), file)
+
+    @classmethod
+    def load(cls, path):
+        """Resumes a calculator from a JSON file written by save."""
+        with open(path) as file:
+            return cls.from_snapshot(json.load(file))